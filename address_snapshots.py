@@ -0,0 +1,99 @@
+# address_snapshots.py
+#
+# Persisted per-address balances. Each cycle only a bounded subset of the
+# watched addresses is refetched; totals are summed from the table, so an
+# address whose lookup failed keeps its last known balance instead of
+# counting as 0.
+
+import os
+import time
+try:
+    import ujson as json
+except ImportError:
+    import json
+
+SNAPSHOT_FILE = "snapshots.json"
+
+
+class AddressSnapshots:
+    """
+    Address -> {"t": last successful fetch, "ok": last attempt succeeded,
+    "balance": float, "assets": {asset: amount}} on flash.
+    """
+
+    def __init__(self, filename=SNAPSHOT_FILE):
+        self.filename = filename
+        self.entries = {}
+        self.dirty = False
+        try:
+            with open(filename) as file:
+                self.entries = json.load(file)
+        except (OSError, ValueError):
+            pass
+
+    def due(self, addresses, limit):
+        """
+        Pick the addresses to fetch this cycle: every never-fetched one (the
+        totals are incomplete without it), then up to `limit` refreshes,
+        failed attempts first, then the oldest.
+        """
+        new = [address for address in addresses if address not in self.entries]
+
+        def priority(address):
+            entry = self.entries[address]
+            return (0 if not entry["ok"] else 1, entry["t"])
+
+        known = sorted([address for address in addresses if address in self.entries], key=priority)
+        return new + (known if limit <= 0 else known[:limit])
+
+    def update(self, address, balance, amounts):
+        self.entries[address] = {"t": time.time(), "ok": True, "balance": balance, "assets": amounts}
+        self.dirty = True
+
+    def mark_failed(self, address):
+        entry = self.entries.get(address)
+        if entry is not None and entry["ok"]:
+            entry["ok"] = False
+            self.dirty = True
+
+    def prune(self, addresses):
+        """Forget addresses that are no longer configured."""
+        for address in list(self.entries):
+            if address not in addresses:
+                del self.entries[address]
+                self.dirty = True
+
+    def totals(self, addresses, assets):
+        """
+        Sum the latest snapshot of every address.
+
+        Returns:
+            dict: {"balance": float, "assets": {asset: float}, "missing": int}
+            where missing counts addresses that have never been fetched.
+        """
+        total_balance = 0.0
+        total_assets = {}
+        for asset in assets:
+            total_assets[asset] = 0.0
+        missing = 0
+        for address in addresses:
+            entry = self.entries.get(address)
+            if entry is None:
+                missing += 1
+                continue
+            total_balance += entry["balance"]
+            for asset in assets:
+                total_assets[asset] += entry["assets"].get(asset, 0.0)
+        return {"balance": total_balance, "assets": total_assets, "missing": missing}
+
+    def save(self):
+        if not self.dirty:
+            return
+        try:
+            temp_filename = self.filename + ".tmp"
+            with open(temp_filename, "w") as file:
+                json.dump(self.entries, file)
+            os.rename(temp_filename, self.filename)
+            self.dirty = False
+        except OSError as e:
+            print(f"Error saving address snapshots: {e}")
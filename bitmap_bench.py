@@ -0,0 +1,86 @@
+"""
+bitmap_bench.py: Compare the cost of storing bitmaps as int lists, bytes
+literals and RLE-compressed bytes.
+
+For each form the bitmaps.py data is rendered back to module source, then
+compiled and executed the way an import would, measuring wall time and the
+heap still held by the resulting module globals. Runs under CPython or on
+the Pico (copy bitmaps.py and rle.py alongside it).
+
+    python bitmap_bench.py
+"""
+
+import gc
+import time
+
+import bitmaps
+import rle
+
+NAMES = ("SATORI_BITMAP", "SATORI_LOGO", "LOLLIPOP_BITMAP")
+ROUNDS = 20
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+
+def list_source():
+    lines = []
+    for name in NAMES:
+        data = getattr(bitmaps, name)
+        lines.append(name + " = [")
+        for i in range(0, len(data), 4):
+            lines.append("    " + ", ".join("0b{:08b}".format(b) for b in data[i:i + 4]) + ",")
+        lines.append("]")
+    return "\n".join(lines)
+
+
+def bytes_source(encode=None):
+    lines = []
+    for name in NAMES:
+        data = getattr(bitmaps, name)
+        if encode:
+            data = encode(data)
+        lines.append(name + " = (")
+        for i in range(0, len(data), 16):
+            lines.append('    b"' + "".join("\\x{:02x}".format(b) for b in data[i:i + 16]) + '"')
+        lines.append(")")
+    return "\n".join(lines)
+
+
+def ticks_us():
+    if hasattr(time, "ticks_us"):
+        return time.ticks_us()
+    return int(time.perf_counter() * 1000000)
+
+
+def heap_used():
+    gc.collect()
+    if tracemalloc:
+        return tracemalloc.get_traced_memory()[0]
+    return gc.mem_alloc()
+
+
+def measure(source):
+    start = ticks_us()
+    for _ in range(ROUNDS):
+        exec(compile(source, "bitmaps", "exec"), {})
+    elapsed = (ticks_us() - start) // ROUNDS
+
+    before = heap_used()
+    module_globals = {}
+    exec(compile(source, "bitmaps", "exec"), module_globals)
+    retained = heap_used() - before
+    return elapsed, retained
+
+
+if __name__ == "__main__":
+    if tracemalloc:
+        tracemalloc.start()
+    print("{:<10} {:>12} {:>14}".format("form", "import (us)", "retained (B)"))
+    for label, source in (("list", list_source()),
+                          ("bytes", bytes_source()),
+                          ("rle", bytes_source(rle.encode))):
+        elapsed, retained = measure(source)
+        print("{:<10} {:>12} {:>14}".format(label, elapsed, retained))
@@ -2,186 +2,128 @@
 bitmaps.py: A library of pre-defined bitmaps for use in MicroPython projects.
 
 This module contains bitmap data for images such as SATORI and LOLLIPOP.
-Each bitmap is represented as a list of binary values, corresponding to rows of the image.
+Each bitmap is a bytes literal of MSB-first rows (MONO_HLSB), so it is a
+single constant that can stay in flash when frozen instead of a list of
+int objects on the heap. Wrap one with memoryview() or
+ScaledText.bitmap_framebuffer() to use it without copying.
+<NAME>_WIDTH / <NAME>_HEIGHT give each image's size. The same layout is
+produced by `png2bmparray.py --batch`.
 
 Usage:
     Import this module in your MicroPython project:
-        from bitmaps import SATORI_BITMAP, SATORI, LOLLIPOP_BITMAP
+        from bitmaps import SATORI_BITMAP, SATORI_LOGO, LOLLIPOP_BITMAP
 """
 
-SATORI_BITMAP = [
-    0b00000000, 0b00000000, 0b00000000, 0b00000000,  # Row 1
-    0b00000000, 0b00000111, 0b11000000, 0b00000000,  # Row 2
-    0b00000000, 0b00111111, 0b11111100, 0b00000000,  # Row 3
-    0b00000000, 0b11111111, 0b11111111, 0b00000000,  # Row 4
-    0b00000001, 0b11110000, 0b00000111, 0b10000000,  # Row 5
-    0b00000011, 0b11000000, 0b00000011, 0b11000000,  # Row 6
-    0b00000111, 0b00000000, 0b00000000, 0b11100000,  # Row 7
-    0b00001110, 0b00000000, 0b00000000, 0b01110000,  # Row 8
-    0b00011100, 0b00000000, 0b00000000, 0b00111000,  # Row 9
-    0b00011100, 0b00000000, 0b00000000, 0b00011000,  # Row 10
-    0b00111000, 0b00000000, 0b00000000, 0b00011100,  # Row 11
-    0b00111000, 0b00000000, 0b00000000, 0b00001101,  # Row 12
-    0b00110000, 0b00000000, 0b00000000, 0b00001100,  # Row 13
-    0b01110000, 0b00000000, 0b00000000, 0b00000110,  # Row 14
-    0b01110000, 0b00000000, 0b00000000, 0b00000110,  # Row 15
-    0b01110000, 0b00000000, 0b00000000, 0b00000110,  # Row 16
-    0b01110000, 0b00000000, 0b10000000, 0b00000110,  # Row 17
-    0b01110000, 0b00000000, 0b10000000, 0b00000110,  # Row 18
-    0b00110000, 0b00000001, 0b11000000, 0b00000110,  # Row 19
-    0b00111000, 0b00000001, 0b11000000, 0b00001100,  # Row 20
-    0b00111000, 0b00000001, 0b10000000, 0b00001101,  # Row 21
-    0b00011100, 0b00000011, 0b11100000, 0b00001000,  # Row 22
-    0b00011100, 0b00000111, 0b11110000, 0b00001000,  # Row 23
-    0b00001110, 0b00000111, 0b11110000, 0b00010000,  # Row 24
-    0b00100111, 0b00000101, 0b11110000, 0b00110100,  # Row 25
-    0b00000111, 0b11001111, 0b11111000, 0b00100000,  # Row 26
-    0b00000011, 0b11111111, 0b11111000, 0b00000000,  # Row 27
-    0b00000000, 0b11111111, 0b11111111, 0b00000000,  # Row 28
-    0b00000010, 0b00111111, 0b11111110, 0b01000000,  # Row 29
-    0b00000000, 0b00001111, 0b11111000, 0b00000000,  # Row 30
-    0b00000000, 0b00000000, 0b00000000, 0b00000000,  # Row 31
-    0b00000000, 0b00000000, 0b00000000, 0b00000000,  # Row 32
-]
+PACKING = "hlsb"
+RLE = False
 
-SATORI_LOGO = [
-    0b00000011, 0b11111100, 0b00000000, 0b00000000,  # Row 1
-    0b00000000, 0b00000000, 0b00000000, 0b00000000,  # Row 2
-    0b00000000, 0b00000000, 0b00000000, 0b00000000,  # Row 3
-    0b00000000, 0b00001111, 0b11111111, 0b00000000,  # Row 4
-    0b00000000, 0b00000000, 0b00000000, 0b00000000,  # Row 5
-    0b00000000, 0b00000000, 0b00000000, 0b00000000,  # Row 6
-    0b00000000, 0b01111000, 0b00011111, 0b11111111,  # Row 7
-    0b10000000, 0b00000000, 0b00000000, 0b00000000,  # Row 8
-    0b11000000, 0b00000000, 0b00000000, 0b00000000,  # Row 9
-    0b00000000, 0b00000000, 0b01111100, 0b00111111,  # Row 10
-    0b00001111, 0b11000000, 0b00000000, 0b00000000,  # Row 11
-    0b00000000, 0b11100000, 0b00000000, 0b00000000,  # Row 12
-    0b00000000, 0b00000000, 0b00000000, 0b01111000,  # Row 13
-    0b00111100, 0b00000001, 0b10000000, 0b00000000,  # Row 14
-    0b00000000, 0b00000001, 0b11100000, 0b00000000,  # Row 15
-    0b00000000, 0b00000000, 0b00000000, 0b00000000,  # Row 16
-    0b01111000, 0b01111000, 0b00000000, 0b00000000,  # Row 17
-    0b00000000, 0b00000000, 0b00000001, 0b11100000,  # Row 18
-    0b00000000, 0b00000000, 0b00000000, 0b00000000,  # Row 19
-    0b00000000, 0b00000000, 0b01111000, 0b00000000,  # Row 20
-    0b00000000, 0b00000000, 0b00000000, 0b00000001,  # Row 21
-    0b11100000, 0b00000000, 0b00000000, 0b00000000,  # Row 22
-    0b00000000, 0b00000000, 0b00000000, 0b01111000,  # Row 23
-    0b00000000, 0b00000000, 0b00000000, 0b00000000,  # Row 24
-    0b00000001, 0b11110000, 0b00000000, 0b00000000,  # Row 25
-    0b00000000, 0b00000000, 0b00000000, 0b00000000,  # Row 26
-    0b01111000, 0b00000000, 0b00000000, 0b00001111,  # Row 27
-    0b11000000, 0b00000111, 0b11111000, 0b00000000,  # Row 28
-    0b00111111, 0b00000000, 0b00000000, 0b00000000,  # Row 29
-    0b00000000, 0b01111100, 0b00000000, 0b00000000,  # Row 30
-    0b00111111, 0b11110000, 0b00001111, 0b11111110,  # Row 31
-    0b00000001, 0b11111111, 0b11000000, 0b00000000,  # Row 32
-    0b00010000, 0b01110000, 0b00111110, 0b00000000,  # Row 33
-    0b00000000, 0b01111111, 0b11111000, 0b00001111,  # Row 34
-    0b11111110, 0b00000011, 0b10000000, 0b11110000,  # Row 35
-    0b00111000, 0b11111100, 0b01111000, 0b00111111,  # Row 36
-    0b00000000, 0b00000000, 0b01111000, 0b01111100,  # Row 37
-    0b00000111, 0b11111000, 0b00000110, 0b00001110,  # Row 38
-    0b00111000, 0b00111111, 0b11111100, 0b01111000,  # Row 39
-    0b00011111, 0b11000000, 0b00000000, 0b00000000,  # Row 40
-    0b00111100, 0b00000011, 0b11110000, 0b00001100,  # Row 41
-    0b01111111, 0b10011100, 0b00111111, 0b11111000,  # Row 42
-    0b01111000, 0b00001111, 0b11110000, 0b00000000,  # Row 43
-    0b00000000, 0b00011110, 0b00000011, 0b11100000,  # Row 44
-    0b00011001, 0b11111111, 0b11001100, 0b00111111,  # Row 45
-    0b10000000, 0b01111000, 0b00000011, 0b11111100,  # Row 46
-    0b00000000, 0b00000000, 0b00011110, 0b00000011,  # Row 47
-    0b11100000, 0b00110011, 0b11111111, 0b11100110,  # Row 48
-    0b00111111, 0b00000000, 0b01111000, 0b00000001,  # Row 49
-    0b11111111, 0b00000000, 0b00000000, 0b00011110,  # Row 50
-    0b00000011, 0b11100000, 0b00110011, 0b11111111,  # Row 51
-    0b11110010, 0b00111110, 0b00000000, 0b01111000,  # Row 52
-    0b00000000, 0b00111111, 0b10000000, 0b00000000,  # Row 53
-    0b11111110, 0b00000011, 0b11100000, 0b00100111,  # Row 54
-    0b11111111, 0b11110011, 0b00111110, 0b00000000,  # Row 55
-    0b01111000, 0b00000000, 0b00011111, 0b11000000,  # Row 56
-    0b00011111, 0b11111110, 0b00000011, 0b11100000,  # Row 57
-    0b01100111, 0b11111111, 0b11111011, 0b00111110,  # Row 58
-    0b00000000, 0b01111000, 0b00000000, 0b00000111,  # Row 59
-    0b11000000, 0b01111111, 0b11111110, 0b00000011,  # Row 60
-    0b11100000, 0b01100111, 0b11111111, 0b11111011,  # Row 61
-    0b00111110, 0b00000000, 0b01111000, 0b00000000,  # Row 62
-    0b00000011, 0b11100000, 0b11111000, 0b00011110,  # Row 63
-    0b00000011, 0b11100000, 0b01100111, 0b11111111,  # Row 64
-    0b11111011, 0b00111100, 0b00000000, 0b01111000,  # Row 65
-    0b00000000, 0b00000011, 0b11100000, 0b11100000,  # Row 66
-    0b00011110, 0b00000001, 0b11000000, 0b01100111,  # Row 67
-    0b11111111, 0b11111011, 0b00111100, 0b00000000,  # Row 68
-    0b01111000, 0b00000000, 0b00000001, 0b11100001,  # Row 69
-    0b11100000, 0b00011110, 0b00000001, 0b11100000,  # Row 70
-    0b01100111, 0b11110011, 0b11111011, 0b00111100,  # Row 71
-    0b00000000, 0b01111000, 0b00000000, 0b00000001,  # Row 72
-    0b11100001, 0b11100000, 0b00011110, 0b00000001,  # Row 73
-    0b11100000, 0b01100111, 0b11110011, 0b11111011,  # Row 74
-    0b00111100, 0b00000000, 0b01111000, 0b00000000,  # Row 75
-    0b00000011, 0b11100001, 0b11100000, 0b00011110,  # Row 76
-    0b00000001, 0b11100000, 0b00110011, 0b11110011,  # Row 77
-    0b11111010, 0b00111100, 0b00000000, 0b01111000,  # Row 78
-    0b11110000, 0b00000011, 0b11000001, 0b11100000,  # Row 79
-    0b00011110, 0b00000001, 0b11100000, 0b00110001,  # Row 80
-    0b11100001, 0b11110110, 0b00111100, 0b00000000,  # Row 81
-    0b01111000, 0b11111100, 0b00001111, 0b11000001,  # Row 82
-    0b11100000, 0b00111110, 0b00000001, 0b11110000,  # Row 83
-    0b00011001, 0b11100001, 0b11111110, 0b00111100,  # Row 84
-    0b00000000, 0b01111100, 0b01111111, 0b11111111,  # Row 85
-    0b10000001, 0b11111000, 0b01111110, 0b00000000,  # Row 86
-    0b11111110, 0b00011100, 0b00000000, 0b11111100,  # Row 87
-    0b00111100, 0b00000000, 0b01111100, 0b00111111,  # Row 88
-    0b11111111, 0b00000000, 0b11111111, 0b11111111,  # Row 89
-    0b00000000, 0b11111110, 0b00001110, 0b00000000,  # Row 90
-    0b00111000, 0b00111100, 0b00000000, 0b01111100,  # Row 91
-    0b00011111, 0b11111110, 0b00000000, 0b01111111,  # Row 92
-    0b11001110, 0b00000000, 0b01111110, 0b00000111,  # Row 93
-    0b10000000, 0b01110000, 0b00111000, 0b00000000,  # Row 94
-    0b01111000, 0b00000011, 0b11110000, 0b00000000,  # Row 95
-    0b00011110, 0b00000000, 0b00000000, 0b00000000,  # Row 96
-    0b00000001, 0b11111111, 0b11100000, 0b00000000,  # Row 97
-    0b00000000, 0b00000000, 0b00000000, 0b00000000,  # Row 98
-    0b00000000, 0b00000000, 0b00000000, 0b00000000,  # Row 99
-    0b00000000, 0b00000000, 0b01111111, 0b00000000,  # Row 100
-    0b00000000, 0b00000000, 0b00000000, 0b00000000,  # Row 101
-    0b00000000, 0b00000000, 0b00000000, 0b00000000,  # Row 102
-    0b00000000, 0b00000000, 0b00000000, 0b00000000,  # Row 103
-    0b00000000, 0b00000000, 0b00000000, 0b00000000,  # Row 104
-]
+SATORI_BITMAP = (  # 32 x 32
+    b"\x00\x00\x00\x00"  # Row 1
+    b"\x00\x07\xc0\x00"  # Row 2
+    b"\x00\x3f\xfc\x00"  # Row 3
+    b"\x00\xff\xff\x00"  # Row 4
+    b"\x01\xf0\x07\x80"  # Row 5
+    b"\x03\xc0\x03\xc0"  # Row 6
+    b"\x07\x00\x00\xe0"  # Row 7
+    b"\x0e\x00\x00\x70"  # Row 8
+    b"\x1c\x00\x00\x38"  # Row 9
+    b"\x1c\x00\x00\x18"  # Row 10
+    b"\x38\x00\x00\x1c"  # Row 11
+    b"\x38\x00\x00\x0d"  # Row 12
+    b"\x30\x00\x00\x0c"  # Row 13
+    b"\x70\x00\x00\x06"  # Row 14
+    b"\x70\x00\x00\x06"  # Row 15
+    b"\x70\x00\x00\x06"  # Row 16
+    b"\x70\x00\x80\x06"  # Row 17
+    b"\x70\x00\x80\x06"  # Row 18
+    b"\x30\x01\xc0\x06"  # Row 19
+    b"\x38\x01\xc0\x0c"  # Row 20
+    b"\x38\x01\x80\x0d"  # Row 21
+    b"\x1c\x03\xe0\x08"  # Row 22
+    b"\x1c\x07\xf0\x08"  # Row 23
+    b"\x0e\x07\xf0\x10"  # Row 24
+    b"\x27\x05\xf0\x34"  # Row 25
+    b"\x07\xcf\xf8\x20"  # Row 26
+    b"\x03\xff\xf8\x00"  # Row 27
+    b"\x00\xff\xff\x00"  # Row 28
+    b"\x02\x3f\xfe\x40"  # Row 29
+    b"\x00\x0f\xf8\x00"  # Row 30
+    b"\x00\x00\x00\x00"  # Row 31
+    b"\x00\x00\x00\x00"  # Row 32
+)
+SATORI_BITMAP_WIDTH = 32
+SATORI_BITMAP_HEIGHT = 32
 
-LOLLIPOP_BITMAP = [
-    0b00000000, 0b00000000, 0b00000000, 0b00000000,  # Row 1
-    0b00000000, 0b00000000, 0b00011111, 0b00000000,  # Row 2
-    0b00000000, 0b00000000, 0b11100000, 0b01100000,  # Row 3
-    0b00000000, 0b00000001, 0b11000011, 0b00010000,  # Row 4
-    0b00000000, 0b00000010, 0b10011000, 0b01101000,  # Row 5
-    0b00000000, 0b00000101, 0b00100000, 0b00011100,  # Row 6
-    0b00000000, 0b00000000, 0b01000111, 0b11001100,  # Row 7
-    0b00000000, 0b00001010, 0b01001000, 0b00100110,  # Row 8
-    0b00000000, 0b00001010, 0b00010111, 0b00010010,  # Row 9
-    0b00000000, 0b00000000, 0b10011100, 0b10001010,  # Row 10
-    0b00000000, 0b00000000, 0b10001100, 0b01001000,  # Row 11
-    0b00000000, 0b00000010, 0b01000110, 0b00001000,  # Row 12
-    0b00000000, 0b00000010, 0b01100110, 0b00001010,  # Row 13
-    0b00000000, 0b00001001, 0b00011000, 0b01001010,  # Row 14
-    0b00000000, 0b00001100, 0b10000010, 0b01001010,  # Row 15
-    0b00000000, 0b00000110, 0b01111100, 0b10010100,  # Row 16
-    0b00000000, 0b00000111, 0b00000001, 0b10010100,  # Row 17
-    0b00000000, 0b00000110, 0b11000110, 0b00101000,  # Row 18
-    0b00000000, 0b00001001, 0b00000000, 0b01110000,  # Row 19
-    0b00000000, 0b00010010, 0b01000000, 0b11000000,  # Row 20
-    0b00000000, 0b00100100, 0b00011111, 0b00000000,  # Row 21
-    0b00000000, 0b01001000, 0b00000000, 0b00000000,  # Row 22
-    0b00000000, 0b10010000, 0b00000000, 0b00000000,  # Row 23
-    0b00000001, 0b00100000, 0b00000000, 0b00000000,  # Row 24
-    0b00000010, 0b01000000, 0b00000000, 0b00000000,  # Row 25
-    0b00000100, 0b10000000, 0b00000000, 0b00000000,  # Row 26
-    0b00001001, 0b00000000, 0b00000000, 0b00000000,  # Row 27
-    0b00010010, 0b00000000, 0b00000000, 0b00000000,  # Row 28
-    0b00100100, 0b00000000, 0b00000000, 0b00000000,  # Row 29
-    0b01001000, 0b00000000, 0b00000000, 0b00000000,  # Row 30
-    0b00110000, 0b00000000, 0b00000000, 0b00000000,  # Row 31
-    0b00000000, 0b00000000, 0b00000000, 0b00000000,  # Row 32
-]
+SATORI_LOGO = (  # 103 x 32
+    b"\x03\xfc\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"  # Row 1
+    b"\x0f\xff\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x78"  # Row 2
+    b"\x1f\xff\x80\x00\x00\x00\xc0\x00\x00\x00\x00\x00\x7c"  # Row 3
+    b"\x3f\x0f\xc0\x00\x00\x00\xe0\x00\x00\x00\x00\x00\x78"  # Row 4
+    b"\x3c\x01\x80\x00\x00\x01\xe0\x00\x00\x00\x00\x00\x78"  # Row 5
+    b"\x78\x00\x00\x00\x00\x01\xe0\x00\x00\x00\x00\x00\x00"  # Row 6
+    b"\x78\x00\x00\x00\x00\x01\xe0\x00\x00\x00\x00\x00\x00"  # Row 7
+    b"\x78\x00\x00\x00\x00\x01\xf0\x00\x00\x00\x00\x00\x00"  # Row 8
+    b"\x78\x00\x00\x0f\xc0\x07\xf8\x00\x3f\x00\x00\x00\x00"  # Row 9
+    b"\x7c\x00\x00\x3f\xf0\x0f\xfe\x01\xff\xc0\x00\x10\x70"  # Row 10
+    b"\x3e\x00\x00\x7f\xf8\x0f\xfe\x03\x80\xf0\x38\xfc\x78"  # Row 11
+    b"\x3f\x00\x00\x78\x7c\x07\xf8\x06\x0e\x38\x3f\xfc\x78"  # Row 12
+    b"\x1f\xc0\x00\x00\x3c\x03\xf0\x0c\x7f\x9c\x3f\xf8\x78"  # Row 13
+    b"\x0f\xf0\x00\x00\x1e\x03\xe0\x19\xff\xcc\x3f\x80\x78"  # Row 14
+    b"\x03\xfc\x00\x00\x1e\x03\xe0\x33\xff\xe6\x3f\x00\x78"  # Row 15
+    b"\x01\xff\x00\x00\x1e\x03\xe0\x33\xff\xf2\x3e\x00\x78"  # Row 16
+    b"\x00\x3f\x80\x00\xfe\x03\xe0\x27\xff\xf3\x3e\x00\x78"  # Row 17
+    b"\x00\x1f\xc0\x1f\xfe\x03\xe0\x67\xff\xfb\x3e\x00\x78"  # Row 18
+    b"\x00\x07\xc0\x7f\xfe\x03\xe0\x67\xff\xfb\x3e\x00\x78"  # Row 19
+    b"\x00\x03\xe0\xf8\x1e\x03\xe0\x67\xff\xfb\x3c\x00\x78"  # Row 20
+    b"\x00\x03\xe0\xe0\x1e\x01\xc0\x67\xff\xfb\x3c\x00\x78"  # Row 21
+    b"\x00\x01\xe1\xe0\x1e\x01\xe0\x67\xf3\xfb\x3c\x00\x78"  # Row 22
+    b"\x00\x01\xe1\xe0\x1e\x01\xe0\x67\xf3\xfb\x3c\x00\x78"  # Row 23
+    b"\x00\x03\xe1\xe0\x1e\x01\xe0\x33\xf3\xfa\x3c\x00\x78"  # Row 24
+    b"\xf0\x03\xc1\xe0\x1e\x01\xe0\x31\xe1\xf6\x3c\x00\x78"  # Row 25
+    b"\xfc\x0f\xc1\xe0\x3e\x01\xf0\x19\xe1\xfe\x3c\x00\x7c"  # Row 26
+    b"\x7f\xff\x81\xf8\x7e\x00\xfe\x1c\x00\xfc\x3c\x00\x7c"  # Row 27
+    b"\x3f\xff\x00\xff\xff\x00\xfe\x0e\x00\x38\x3c\x00\x7c"  # Row 28
+    b"\x1f\xfe\x00\x7f\xce\x00\x7e\x07\x80\x70\x38\x00\x78"  # Row 29
+    b"\x03\xf0\x00\x1e\x00\x00\x00\x01\xff\xe0\x00\x00\x00"  # Row 30
+    b"\x00\x00\x00\x00\x00\x00\x00\x00\x7f\x00\x00\x00\x00"  # Row 31
+    b"\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"  # Row 32
+)
+SATORI_LOGO_WIDTH = 103
+SATORI_LOGO_HEIGHT = 32
+
+LOLLIPOP_BITMAP = (  # 32 x 32
+    b"\x00\x00\x00\x00"  # Row 1
+    b"\x00\x00\x1f\x00"  # Row 2
+    b"\x00\x00\xe0\x60"  # Row 3
+    b"\x00\x01\xc3\x10"  # Row 4
+    b"\x00\x02\x98\x68"  # Row 5
+    b"\x00\x05\x20\x1c"  # Row 6
+    b"\x00\x00\x47\xcc"  # Row 7
+    b"\x00\x0a\x48\x26"  # Row 8
+    b"\x00\x0a\x17\x12"  # Row 9
+    b"\x00\x00\x9c\x8a"  # Row 10
+    b"\x00\x00\x8c\x48"  # Row 11
+    b"\x00\x02\x46\x08"  # Row 12
+    b"\x00\x02\x66\x0a"  # Row 13
+    b"\x00\x09\x18\x4a"  # Row 14
+    b"\x00\x0c\x82\x4a"  # Row 15
+    b"\x00\x06\x7c\x94"  # Row 16
+    b"\x00\x07\x01\x94"  # Row 17
+    b"\x00\x06\xc6\x28"  # Row 18
+    b"\x00\x09\x00\x70"  # Row 19
+    b"\x00\x12\x40\xc0"  # Row 20
+    b"\x00\x24\x1f\x00"  # Row 21
+    b"\x00\x48\x00\x00"  # Row 22
+    b"\x00\x90\x00\x00"  # Row 23
+    b"\x01\x20\x00\x00"  # Row 24
+    b"\x02\x40\x00\x00"  # Row 25
+    b"\x04\x80\x00\x00"  # Row 26
+    b"\x09\x00\x00\x00"  # Row 27
+    b"\x12\x00\x00\x00"  # Row 28
+    b"\x24\x00\x00\x00"  # Row 29
+    b"\x48\x00\x00\x00"  # Row 30
+    b"\x30\x00\x00\x00"  # Row 31
+    b"\x00\x00\x00\x00"  # Row 32
+)
+LOLLIPOP_BITMAP_WIDTH = 32
+LOLLIPOP_BITMAP_HEIGHT = 32
@@ -0,0 +1,146 @@
+"""
+build_mpy.py: Cross-compile the SatoriScreen libraries to .mpy for the
+updater.
+
+Every module in main.py's REQUIRED_LIBRARIES except main itself (the Pico
+only runs main.py from source) is compiled with mpy-cross into dist/,
+together with dist/manifest.json:
+
+    {"version": "v1.2-3-gabc1234", "mpy": 6,
+     "files": {"bitmaps": {"file": "bitmaps.mpy", "size": 2931, "sha256": "...",
+                           "source": {"size": 5448, "sha256": "..."}},
+               "main": {"source": {...}}, ...}}
+
+The size and SHA-256 of each .mpy and of the .py it came from let the
+updater skip files it already has and verify the ones it downloads, so
+rebuild and commit dist/ whenever a library changes.
+
+Project modules are taken from this directory; the fonts (and anything
+else not present here) are downloaded from their REQUIRED_LIBRARIES URL
+into build/ once. Commit dist/ so GitHubUpdater can fetch it from
+MPY_BASE_URL. A device whose firmware reads a different .mpy version
+(see "mpy" in the manifest) keeps installing the .py sources, so build
+with an mpy-cross emitting the version the screens' firmware reads
+(mpy-cross --version shows it):
+
+    pip install mpy-cross
+    python build_mpy.py [--version v1.2] [--output dist]
+
+Loading bytecode skips the on-device compile: imports are faster and the
+large font and bitmap modules no longer need the compiler's transient heap.
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import urllib.request
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SKIP = ("main",)  # must stay .py: the Pico only runs main.py from source
+
+
+def required_libraries(main_path):
+    """REQUIRED_LIBRARIES from main.py, read without importing it (it needs the Pico's modules)."""
+    with open(main_path) as file:
+        tree = ast.parse(file.read(), main_path)
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(
+                isinstance(target, ast.Name) and target.id == "REQUIRED_LIBRARIES" for target in node.targets):
+            return ast.literal_eval(node.value)
+    raise ValueError(f"{main_path}: REQUIRED_LIBRARIES not found")
+
+
+def source_path(name, url, cache_dir):
+    """The local copy of library `name`, downloading it into cache_dir if it is not part of this repo."""
+    local = os.path.join(HERE, f"{name}.py")
+    if os.path.exists(local):
+        return local
+    cached = os.path.join(cache_dir, f"{name}.py")
+    if not os.path.exists(cached):
+        print(f"Downloading {name} from {url}")
+        os.makedirs(cache_dir, exist_ok=True)
+        with urllib.request.urlopen(url, timeout=30) as response, open(cached + ".tmp", "wb") as file:
+            shutil.copyfileobj(response, file)
+        os.replace(cached + ".tmp", cached)
+    return cached
+
+
+def mpy_cross_command(path):
+    """How to run mpy-cross: `path` if given, else mpy-cross on PATH, else the mpy_cross package."""
+    if path:
+        return [path]
+    if shutil.which("mpy-cross"):
+        return ["mpy-cross"]
+    try:
+        import mpy_cross  # noqa: F401
+    except ImportError:
+        raise SystemExit("mpy-cross not found: pip install mpy-cross, or pass --mpy-cross PATH")
+    return [sys.executable, "-m", "mpy_cross"]
+
+
+def mpy_version(mpy_file):
+    """
+    The .mpy version byte. Bytecode-only files (no native code) load on any
+    firmware with the same version, whatever its sub-version or architecture;
+    the device compares it with sys.implementation._mpy & 0xff.
+    """
+    with open(mpy_file, "rb") as file:
+        header = file.read(4)
+    if header[:1] != b"M":
+        raise ValueError(f"{mpy_file}: not a .mpy file")
+    return header[1]
+
+
+def file_entry(path):
+    with open(path, "rb") as file:
+        data = file.read()
+    return {"size": len(data), "sha256": hashlib.sha256(data).hexdigest()}
+
+
+def git_version():
+    try:
+        return subprocess.run(["git", "describe", "--tags", "--always", "--dirty"], cwd=HERE,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "dev"
+
+
+def build(output, version, mpy_cross, cache_dir):
+    command = mpy_cross_command(mpy_cross)
+    os.makedirs(output, exist_ok=True)
+    files = {}
+    versions = set()
+    for name, url in required_libraries(os.path.join(HERE, "main.py")).items():
+        source = source_path(name, url, cache_dir)
+        if name in SKIP:
+            files[name] = {"source": file_entry(source)}
+            continue
+        target = os.path.join(output, f"{name}.mpy")
+        # -s keeps tracebacks naming the module rather than the build path
+        subprocess.run(command + ["-s", f"{name}.py", "-o", target, source], check=True)
+        versions.add(mpy_version(target))
+        files[name] = dict(file_entry(target), file=f"{name}.mpy", source=file_entry(source))
+        print(f"{name}: {files[name]['source']['size']} -> {files[name]['size']} bytes")
+    if len(versions) != 1:
+        raise SystemExit(f"mixed .mpy versions in one build: {sorted(versions)}")
+    manifest = {"version": version, "mpy": versions.pop(), "files": files}
+    with open(os.path.join(output, "manifest.json"), "w") as file:
+        json.dump(manifest, file, indent=1, sort_keys=True)
+        file.write("\n")
+    print(f"Wrote {len(files) - len(SKIP)} modules and manifest.json ({version}, mpy v{manifest['mpy']}) to {output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cross-compile the SatoriScreen libraries to .mpy.")
+    parser.add_argument("--output", default=os.path.join(HERE, "dist"), help="Output directory (default dist/).")
+    parser.add_argument("--version", default=None, help="Version tag for the manifest (default: git describe).")
+    parser.add_argument("--mpy-cross", default=None, metavar="PATH", help="mpy-cross executable to use.")
+    parser.add_argument("--cache", default=os.path.join(HERE, "build"),
+                        help="Where downloaded library sources are kept (default build/).")
+    args = parser.parse_args()
+    build(args.output, args.version or git_version(), args.mpy_cross, args.cache)
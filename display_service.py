@@ -1,126 +1,342 @@
 # display_service.py
 
-import urequests
-import ujson
+try:
+    import asyncio
+except ImportError:
+    import uasyncio as asyncio
 import gc
+import os
 import time
-from scaled_text import ScaledText
-from bitmaps import SATORI_BITMAP, LOLLIPOP_BITMAP, SATORI_LOGO
+import http_client
+from satori_api import ADDRESS_URL, NEURONS_URL, ASSETS
+from satori_api import address_extractor, parse_address, neurons_extractor, parse_neurons
+from response_cache import ResponseCache
+from address_snapshots import AddressSnapshots
+import price_sources
+import fleet_record
+
+# Fonts used for the large numerals; drawing falls back to ScaledText if missing
+BALANCE_FONT = "freesans20"
+PRICE_FONT = "freesans20"
+
+FETCH_CONCURRENCY = 4  # Address lookups in flight at once
+ADDRESSES_PER_CYCLE = 8  # Snapshots refreshed per cycle, besides never-fetched addresses; the rest keep their last snapshot (0 = all)
+AGGREGATOR_FILE = "AGGREGATOR"  # Holds the fleet_aggregator base URL, if one is used
+THIN_CLIENT_FILE = "THIN_CLIENT"  # If present too, the aggregator renders whole frames (thin_render.py)
+CONNECTIONS_PER_HOST = 1  # Keep-alive connections per upstream host (each TLS session costs heap)
+# Seconds a cached response is used without asking the server. The neuron
+# report is regenerated daily; the price is always refetched but still falls
+# back to the cached value when the fetch fails. Balances are kept per
+# address in AddressSnapshots instead.
+CACHE_TTL = {
+    "neurons": 6 * 3600,
+    "price": 0,
+}
 
 
 class DisplayService:
-    def __init__(self, epd_width=128, epd_height=296):
+    def __init__(self, epd_width=128, epd_height=296, addresses_per_cycle=ADDRESSES_PER_CYCLE):
         self.EPD_WIDTH = epd_width
         self.EPD_HEIGHT = epd_height
-        
-    def fetch_neurons_data(self, watchdog):
-        """Fetch current Satori Network statistics."""
+        self.addresses_per_cycle = addresses_per_cycle
+        self._writers = {}
+        self.cache = ResponseCache()
+        self.snapshots = AddressSnapshots()
+        self.aggregator = self._read_aggregator()
+        self.thin_client = self.aggregator is not None and self._file_exists(THIN_CLIENT_FILE)
+
+    def _file_exists(self, filename):
+        try:
+            os.stat(filename)
+            return True
+        except OSError:
+            return False
+
+    def _read_aggregator(self):
         try:
+            with open(AGGREGATOR_FILE) as file:
+                url = file.read().strip().rstrip("/")
+            if url:
+                print(f"Using fleet aggregator at {url}")
+            return url or None
+        except OSError:
+            return None
+
+    def get_writer(self, epd, font_name):
+        """Return a FontWriter for `font_name`, or None if the font is not installed."""
+        if font_name not in self._writers:
+            try:
+                from font_writer import FontWriter
+                self._writers[font_name] = FontWriter(epd, __import__(font_name))
+            except ImportError as e:
+                print(f"Font '{font_name}' unavailable, using scaled text: {e}")
+                self._writers[font_name] = None
+        return self._writers[font_name]
+        
+    async def _feed_watchdog(self, watchdog):
+        while True:
             watchdog.feed()
+            await asyncio.sleep(1)
+
+    async def _run_fed(self, coro, watchdog):
+        """Run `coro` while a background task keeps the watchdog fed."""
+        feeder = asyncio.create_task(self._feed_watchdog(watchdog))
+        try:
+            return await coro
+        finally:
+            feeder.cancel()
+            self.cache.save()
+            self.snapshots.save()
+
+    def _stale(self, key, error):
+        """Last good value for `key` after a failed fetch (None if there is none)."""
+        value = self.cache.stale(key)
+        if value is not None:
+            print(f"Using cached {key} after error: {error}")
+        return value
+
+    async def fetch_neurons_data_async(self, pool=None):
+        """Fetch current Satori Network statistics (served from cache while fresh)."""
+        cached = self.cache.fresh("neurons", CACHE_TTL["neurons"])
+        if cached is not None:
+            return cached
+        try:
             gc.collect()
-            response = urequests.get(
-                "https://satorinet.io/reports/daily/stats/predictors/latest",
-                headers={'Accept': 'application/json'}
-            )
-            valid_json = response.text.replace("NaN", "null")
-            response=None
-            gc.collect()
-            data = ujson.loads(valid_json)
-            valid_json=None
+            headers = {'Accept': 'application/json'}
+            etag = self.cache.etag("neurons")
+            if etag:
+                headers['If-None-Match'] = etag
+            # Stream the (large, NaN-laden) body through the extractor so only
+            # the three fields we show are ever held in RAM
+            fields = neurons_extractor()
+            response = await http_client.get(NEURONS_URL, headers=headers, pool=pool, consumer=fields)
             gc.collect()
-            
-            return {
-                "current_stake_requirement": float(data.get("Current Staking Requirement", 0.0)),
-                "current_neuron_version": data.get("Current Neuron Version", "Unknown"),
-                "competing_neurons": int(data.get("Competing Neurons", 0))
-            }
+            if response.status_code == 304:
+                self.cache.touch("neurons")
+                return self.cache.stale("neurons")
+            if response.status_code != 200:
+                return self._stale("neurons", f"HTTP {response.status_code}")
+
+            neurons_data = parse_neurons(fields)
+            self.cache.store("neurons", neurons_data, response.headers.get("etag"))
+            return neurons_data
         except Exception as e:
             print(f"Error fetching neurons data: {e}")
-            return None
-        finally:
+            return self._stale("neurons", e)
+
+    async def fetch_address_info_async(self, address, assets=ASSETS, pool=None):
+        """
+        Fetch one address, retrying up to 3 times.
+
+        Returns:
+            tuple: (balance, {asset: amount}) or None if every attempt failed.
+        """
+        for attempt in range(3):
             try:
-                response.close()
-            except:
-                pass
+                gc.collect()
+                fields = address_extractor(assets)
+                response = await http_client.get(ADDRESS_URL + address, pool=pool, consumer=fields)
+                if response.status_code == 200:
+                    return parse_address(fields, assets)
+            except Exception as e:
+                print(f"Error fetching address {address} (attempt {attempt + 1}): {e}")
+                if attempt < 2:
+                    await asyncio.sleep(2)
+        return None
 
-    def fetch_all_address_info(self, addresses, watchdog):
-        """Fetch balance and asset information for all configured addresses."""
-        total_balance = 0.0
-        total_assets = {"SATORI": 0.0, "LOLLIPOP": 0.0}
-
-        for address in addresses:
-            for attempt in range(3):
-                try:
-                    watchdog.feed()
-                    gc.collect()
-                    response = urequests.get(f"https://evr.cryptoscope.io/api/getaddress/?address={address}")
-                    if response.status_code == 200:
-                        data = response.json()
-                        response=None
-                        gc.collect()
-                        total_balance += float(data.get("balance", 0.0))
-                        
-                        assets = data.get("assets", {})
-                        for asset in total_assets:
-                            if asset in assets:
-                                total_assets[asset] += float(assets[asset])
-                        data = None
-                        gc.collect()
-                        break
-                except Exception as e:
-                    print(f"Error fetching address {address} (attempt {attempt + 1}): {e}")
-                    if attempt < 2:
-                        time.sleep(2)
-
-        return {"balance": total_balance, "assets": total_assets}
+    async def fetch_all_address_info_async(self, addresses, concurrency=FETCH_CONCURRENCY, pool=None):
+        """
+        Fetch every address with no snapshot yet plus up to
+        `addresses_per_cycle` refreshes (failed first, then the oldest),
+        `concurrency` at a time, and total every address from the table.
 
-    def get_satori_price(self, watchdog):
-        """Fetch current SATORI price from Safe.Trade."""
+        Returns:
+            dict: {"balance", "assets", "missing"} where missing counts
+            addresses with no snapshot yet.
+        """
+        snapshots = self.snapshots
+        snapshots.prune(addresses)
+        pending = snapshots.due(addresses, self.addresses_per_cycle)
+
+        async def worker():
+            while pending:
+                address = pending.pop(0)
+                result = await self.fetch_address_info_async(address, ASSETS, pool)
+                if result:
+                    snapshots.update(address, result[0], result[1])
+                else:
+                    snapshots.mark_failed(address)
+
+        await asyncio.gather(*[worker() for _ in range(min(concurrency, len(pending)))])
+        totals = snapshots.totals(addresses, ASSETS)
+        if totals["missing"]:
+            print(f"{totals['missing']} address(es) not fetched yet, totals are partial")
+        return totals
+
+    async def get_satori_price_async(self, pool=None):
+        """Fetch current SATORI price from the first price source to answer."""
+        gc.collect()
+        result = await price_sources.first_price(price_sources.PRICE_SOURCES, pool)
+        if result is None:
+            return self._stale("price", "all price sources failed")
+        source, price = result
+        print(f"SATORI price from {source}: {price}")
+        self.cache.store("price", price)
+        return price
+
+    async def fetch_fleet_record_async(self, addresses):
+        """
+        Fetch everything in one small request from the fleet aggregator.
+
+        Returns:
+            list: [balance_data, neurons_data, satori_price], or None on failure.
+        """
         try:
-            watchdog.feed()
-            headers = {
-                'User-Agent': 'Mozilla/5.0',
-                'Accept': 'application/json'
-            }
-            gc.collect()
-            response = urequests.get("https://safe.trade/api/v2/trade/public/tickers/satoriusdt", 
-                                headers=headers)
-            if response.status_code == 200:
-                return float(response.json()['avg_price'])
-            return None
+            response = await http_client.get(f"{self.aggregator}/record?addresses={','.join(addresses)}")
+            if response.status_code != 200:
+                raise ValueError(f"HTTP {response.status_code}")
+            balance_data, neurons_data, satori_price, _ = fleet_record.unpack(response.content)
+            return [balance_data, neurons_data, satori_price]
         except Exception as e:
-            print(f"Error fetching SATORI price: {e}")
+            print(f"Error fetching fleet record, fetching upstream directly: {e}")
             return None
+
+    async def stream_frame_async(self, epd, addresses):
+        """Download a rendered frame straight into panel RAM; returns True if complete."""
+        stream = epd.ram_stream(0x24)
+        try:
+            response = await http_client.get(f"{self.aggregator}/frame?addresses={','.join(addresses)}",
+                                             consumer=stream)
         finally:
-            try:
-                response.close()
-            except:
-                pass
+            stream.close()
+        if response.status_code != 200 or stream.count != len(epd.buffer):
+            print(f"Bad frame: HTTP {response.status_code}, {stream.count} bytes")
+            return False
+        return True
+
+    def show_remote_frame(self, epd, addresses, watchdog):
+        """
+        Thin-client update: the aggregator renders the frame and it is
+        streamed into the panel in chunks, then shown with a full refresh
+        (left running, like RefreshEngine.show(wait=False)).
+
+        Returns:
+            bool: False if the frame could not be fetched; render locally instead.
+        """
+        try:
+            epd.wake()
+            if not asyncio.run(self._run_fed(self.stream_frame_async(epd, addresses), watchdog)):
+                return False
+            epd.TurnOnDisplay(wait=False)
+            return True
+        except Exception as e:
+            print(f"Error fetching rendered frame, rendering locally: {e}")
+            return False
+
+    async def fetch_all_async(self, addresses, watchdog):
+        """
+        Run the address lookups, neuron stats and price fetch in parallel over
+        one pool of keep-alive connections (one per upstream host).
+        With an AGGREGATOR configured, ask it first instead.
+        """
+        if self.aggregator:
+            result = await self._run_fed(self.fetch_fleet_record_async(addresses), watchdog)
+            if result:
+                return result
+        pool = http_client.ConnectionPool(CONNECTIONS_PER_HOST)
+        try:
+            return await self._run_fed(asyncio.gather(
+                self.fetch_all_address_info_async(addresses, pool=pool),
+                self.fetch_neurons_data_async(pool),
+                self.get_satori_price_async(pool),
+            ), watchdog)
+        finally:
+            print(f"HTTP connections opened this cycle: {pool.handshakes}")
+            await pool.close()
+
+    def fetch_all(self, addresses, watchdog):
+        """
+        Fetch everything the screen shows in one concurrent pass.
+
+        Returns:
+            tuple: (balance_data, neurons_data, satori_price)
+        """
+        return tuple(asyncio.run(self.fetch_all_async(addresses, watchdog)))
+
+    # Blocking single-source wrappers, kept for callers that fetch one thing
+    def fetch_neurons_data(self, watchdog):
+        """Fetch current Satori Network statistics."""
+        return asyncio.run(self._run_fed(self.fetch_neurons_data_async(), watchdog))
+
+    def fetch_all_address_info(self, addresses, watchdog):
+        """Fetch balance and asset information for all configured addresses."""
+        return asyncio.run(self._run_fed(self.fetch_all_address_info_async(addresses), watchdog))
+
+    def get_satori_price(self, watchdog):
+        """Fetch current SATORI price from the first price source to answer."""
+        return asyncio.run(self._run_fed(self.get_satori_price_async(), watchdog))
 
     def update_display(self, epd, text_handler, balance_data, neurons_data, satori_price, watchdog, stats=None):
         """Update the e-paper display with current data."""
-        try:
-            print("Starting display update...")
-            
+        print("Starting display update...")
+        if not self.draw_static(epd, text_handler):
+            return False
+        watchdog.feed()
+        return self.draw_dynamic(epd, text_handler, balance_data, neurons_data, satori_price, watchdog, stats)
+
+    def _blit(self, text_handler, x, y, name):
+        """Draw bitmaps.<name> in the packing and compression bitmaps.py was generated with."""
+        # Imported on first draw: thin clients never need the bitmaps
+        import bitmaps
+        text_handler.blit_bitmap(x, y, getattr(bitmaps, name), getattr(bitmaps, name + "_WIDTH"),
+                                 getattr(bitmaps, name + "_HEIGHT"), packing=bitmaps.PACKING,
+                                 compressed=getattr(bitmaps, "RLE", False))
 
-            
+    def draw_static(self, epd, text_handler):
+        """
+        Draw the parts of the frame that do not depend on fetched data (background,
+        logo, labels). Can run before the network is up; see pipeline.py.
+        """
+        try:
             epd.fill(1)
-            watchdog.feed()
 
-            # Draw SATORI logo and balance
             try:
-                text_handler.draw_bitmap(0, 0, SATORI_LOGO, 103, 32)
+                self._blit(text_handler, 0, 0, "SATORI_LOGO")
+            except Exception as e:
+                print(f"Error drawing SATORI logo: {e}")
+
+            text_handler.draw_scaled_text("EVR: ", 0, 80, scale=2)
+            text_handler.draw_scaled_text("Updated: ", 0, 112, scale=1)
+            return True
+
+        except Exception as e:
+            print(f"Critical error in draw_static: {e}")
+            return False
+
+    def draw_dynamic(self, epd, text_handler, balance_data, neurons_data, satori_price, watchdog, stats=None):
+        """Draw the fetched values over a frame prepared by draw_static()."""
+        try:
+            # Draw SATORI balance
+            try:
                 satori_balance = balance_data["assets"].get("SATORI", 0.0)
-                text_handler.draw_scaled_text(f"{satori_balance:.2f}", 0, 40, scale=3)
+                writer = self.get_writer(epd, BALANCE_FONT)
+                if writer:
+                    writer.draw_text(f"{satori_balance:.2f}", 0, 40)
+                else:
+                    text_handler.draw_scaled_text(f"{satori_balance:.2f}", 0, 40, scale=3)
             except Exception as e:
                 print(f"Error drawing SATORI section: {e}")
 
             # Draw SATORI price with dynamic positioning
             try:
                 if satori_price is not None:
-                    price_str = str(satori_price)
-                    adjusted_x = 200 - (max(0, len(price_str) - 5) * 16)
-                    text_handler.draw_scaled_text(f"${satori_price}", adjusted_x, 0, scale=2)
+                    writer = self.get_writer(epd, PRICE_FONT)
+                    if writer:
+                        writer.draw_text_right(f"${satori_price}", self.EPD_HEIGHT, 0)
+                    else:
+                        price_str = str(satori_price)
+                        adjusted_x = 200 - (max(0, len(price_str) - 5) * 16)
+                        text_handler.draw_scaled_text(f"${satori_price}", adjusted_x, 0, scale=2)
             except Exception as e:
                 print(f"Error drawing price section: {e}")
 
@@ -129,18 +345,20 @@ class DisplayService:
             # Draw EVR balance
             try:
                 evr_balance = balance_data.get('balance', 0.0)
-                text_handler.draw_scaled_text(f"EVR: {evr_balance:.2f}", 0, 80, scale=2)
+                # "EVR: " is drawn by draw_static(); glyphs are 16 px wide at scale 2
+                text_handler.draw_scaled_text(f"{evr_balance:.2f}", 5 * 16, 80, scale=2)
             except Exception as e:
                 print(f"Error drawing EVR balance: {e}")
 
             # Draw timestamp
             try:
                 current_time = time.localtime()
+                # After the "Updated: " label from draw_static()
                 text_handler.draw_scaled_text(
-                    "Updated: %02d:%02d %02d/%02d/%02d" % 
-                    (current_time[3], current_time[4], current_time[2], 
-                     current_time[1], current_time[0] % 100), 
-                    0, 112, scale=1
+                    "%02d:%02d %02d/%02d/%02d" %
+                    (current_time[3], current_time[4], current_time[2],
+                     current_time[1], current_time[0] % 100),
+                    9 * 8, 112, scale=1
                 )
             except Exception as e:
                 print(f"Error drawing timestamp: {e}")
@@ -180,7 +398,7 @@ class DisplayService:
             # Draw LOLLIPOP icon if present
             try:
                 if balance_data["assets"].get("LOLLIPOP", 0) > 0:
-                    text_handler.draw_bitmap(261, 86, LOLLIPOP_BITMAP, 32, 32)
+                    self._blit(text_handler, 261, 86, "LOLLIPOP_BITMAP")
             except Exception as e:
                 print(f"Error drawing LOLLIPOP icon: {e}")
 
@@ -188,5 +406,5 @@ class DisplayService:
             return True
 
         except Exception as e:
-            print(f"Critical error in update_display: {e}")
+            print(f"Critical error in draw_dynamic: {e}")
             return False
@@ -1,9 +1,13 @@
 # https://github.com/waveshareteam/Pico_ePaper_Code/blob/main/python/Pico_ePaper-2.9.py
 # Much of this comes from the waveshare github, the manufacturer of the screen.
 
-from machine import Pin, SPI
+from machine import Pin, SPI, idle
 import framebuf
 import utime
+try:
+    import asyncio
+except ImportError:
+    import uasyncio as asyncio
 
 # Pin definitions
 RST_PIN = 12
@@ -15,6 +19,9 @@ BUSY_PIN = 13
 EPD_WIDTH = 128
 EPD_HEIGHT = 296
 
+# A full refresh takes ~3 s; anything far beyond that means the panel is stuck
+BUSY_TIMEOUT_MS = 10000
+
 # LUT for full update
 WS_20_30 = [                                    
     0x80,    0x66,    0x0,    0x0,    0x0,    0x0,    0x0,    0x0,    0x40,    0x0,    0x0,    0x0,
@@ -61,8 +68,98 @@ WF_PARTIAL_2IN9 = [
     0x22,0x17,0x41,0xB0,0x32,0x36,
 ]
 
+# Command scripts
+# ---------------
+# A script is a bytes object of packed entries: command, data length, flags,
+# then the data bytes. run_script() replays one with a single SPI write per
+# command. Scripts are built once at import time.
+WAIT_BUSY = 0x01
+
+def build_script(entries):
+    """Pack (command, data, wait_busy) tuples into a command script."""
+    script = bytearray()
+    for command, data, wait_busy in entries:
+        script.append(command)
+        script.append(len(data))
+        script.append(WAIT_BUSY if wait_busy else 0)
+        script.extend(data)
+    return bytes(script)
+
+def lut_script(lut):
+    return build_script((
+        (0x32, lut[0:153], True),
+        (0x3f, lut[153:154], False),
+        (0x03, lut[154:155], False),    # gate voltage
+        (0x04, lut[155:158], False),    # source voltage VSH, VSH2, VSL
+        (0x2c, lut[158:159], False),    # VCOM
+    ))
+
+def config_script(data_entry_mode):
+    return build_script((
+        (0x01, (0x27, 0x01, 0x00), False),  # Driver output control
+        (0x11, (data_entry_mode,), False),  # data entry mode
+        (0x21, (0x00, 0x80), False),        # Display update control
+    ))
+
+SWRESET_SCRIPT = build_script(((0x12, (), True),))
+# Y increment, Y first; X decrement (native order) or increment
+CONFIG_NATIVE_SCRIPT = config_script(0x06)
+CONFIG_SCAN_SCRIPT = config_script(0x07)
+FULL_LUT_SCRIPT = lut_script(WS_20_30)
+PARTIAL_LUT_SCRIPT = lut_script(WF_PARTIAL_2IN9)
+PARTIAL_SETUP_SCRIPT = build_script((
+    (0x37, (0x00, 0x00, 0x00, 0x00, 0x00, 0x40, 0x00, 0x00, 0x00, 0x00), False),
+    (0x3C, (0x80,), False),                 # BorderWaveform
+    (0x22, (0xC0,), False),
+    (0x20, (), True),
+))
+
+class RamStream:
+    """
+    Body consumer (see http_client) that writes a frame into panel RAM as it
+    arrives, so a downloaded frame never needs a buffer of its own. Needs
+    native_order: the bytes are sent in framebuffer order. Anything past one
+    frame is counted but dropped; check count == len(epd.buffer) before
+    turning the display on.
+    """
+
+    def __init__(self, epd, command=0x24):
+        self.epd = epd
+        self.count = 0
+        self.limit = len(epd.buffer)
+        self.active = True
+        epd.SetFullWindow()
+        epd.send_command(command)
+        epd.digital_write(epd.dc_pin, 1)
+        epd.digital_write(epd.cs_pin, 0)
+
+    def feed(self, chunk):
+        room = self.limit - self.count
+        if room > 0:
+            self.epd.spi.write(chunk if len(chunk) <= room else chunk[:room])
+        self.count += len(chunk)
+
+    def close(self):
+        if self.active:
+            self.epd.digital_write(self.epd.cs_pin, 1)
+            self.active = False
+
+# Panel lifecycle states
+PANEL_COLD = 0      # power-on / unknown: needs hardware reset and SWRESET
+PANEL_SLEEP = 1     # deep sleep: needs a hardware reset to wake
+PANEL_READY = 2     # configured and awake
+
 class EPD_2in9_Landscape(framebuf.FrameBuffer):
-    def __init__(self):
+    def __init__(self, native_order=True, verbose=False):
+        # native_order: scan panel RAM with the X address decrementing so the
+        # MONO_VLSB framebuffer is already in the order the controller expects
+        # and a frame upload is one spi.write(). Set False for the original
+        # Waveshare X-increment scan (frame sent band by band, reversed).
+        self.native_order = native_order
+        self.verbose = verbose
+        self._busy_released = False
+        self._busy_flag = None
+        self._busy_handler = self._busy_irq  # bound once, reused by every IRQ registration
         self.reset_pin = Pin(RST_PIN, Pin.OUT)
         self.busy_pin = Pin(BUSY_PIN, Pin.IN, Pin.PULL_UP)
         self.cs_pin = Pin(CS_PIN, Pin.OUT)
@@ -74,6 +171,12 @@ class EPD_2in9_Landscape(framebuf.FrameBuffer):
         self.spi.init(baudrate=4000_000)
         self.dc_pin = Pin(DC_PIN, Pin.OUT)
         self.buffer = bytearray(self.height * self.width // 8)
+        # Scratch for commands and short runtime-computed data (window, cursor)
+        self._scratch = bytearray(4)
+        self._scratch_mv = memoryview(self._scratch)
+        self.partial_mode = False
+        self.state = PANEL_COLD
+        self.loaded_lut = None
         super().__init__(self.buffer, self.height, self.width, framebuf.MONO_VLSB)
         self.init()
 
@@ -92,25 +195,29 @@ class EPD_2in9_Landscape(framebuf.FrameBuffer):
     def module_exit(self):
         self.digital_write(self.reset_pin, 0)
 
-    # Hardware reset
+    # Hardware reset; callers follow with ReadBusy() rather than a fixed delay
     def reset(self):
-        self.digital_write(self.reset_pin, 1)
-        self.delay_ms(50) 
         self.digital_write(self.reset_pin, 0)
         self.delay_ms(2)
         self.digital_write(self.reset_pin, 1)
-        self.delay_ms(50)   
+        self.delay_ms(10)   # BUSY is not valid until ~10 ms after reset
 
     def send_command(self, command):
+        self._scratch[0] = command
         self.digital_write(self.dc_pin, 0)
         self.digital_write(self.cs_pin, 0)
-        self.spi_writebyte([command])
+        self.spi.write(self._scratch_mv[0:1])
         self.digital_write(self.cs_pin, 1)
 
     def send_data(self, data):
+        self._scratch[0] = data
+        self.send_buffer(self._scratch_mv[0:1])
+
+    def send_buffer(self, buf):
+        """Send a buffer as data in one SPI write, without copying it."""
         self.digital_write(self.dc_pin, 1)
         self.digital_write(self.cs_pin, 0)
-        self.spi_writebyte([data])
+        self.spi.write(buf)
         self.digital_write(self.cs_pin, 1)
         
     def send_data1(self, buf):
@@ -119,23 +226,118 @@ class EPD_2in9_Landscape(framebuf.FrameBuffer):
         self.spi.write(bytearray(buf))
         self.digital_write(self.cs_pin, 1)
         
-    def ReadBusy(self):
-        print("e-Paper busy")
-        while(self.digital_read(self.busy_pin) == 1):      #  0: idle, 1: busy
-            self.delay_ms(10) 
-        print("e-Paper busy release")  
+    def write_ram(self, command, image):
+        """Send a RAM write command followed by a whole frame.
 
-    def TurnOnDisplay(self):
+        The frame is streamed with CS held low for the entire transfer. In
+        native order it is a single spi.write(); otherwise it is sent as one
+        memoryview slice per 8-pixel band, last band first.
+        """
+        self.send_command(command)
+        self.digital_write(self.dc_pin, 1)
+        self.digital_write(self.cs_pin, 0)
+        if self.native_order:
+            self.spi.write(image)
+        else:
+            mv = memoryview(image)
+            row = self.height
+            for j in range(self.width // 8 - 1, -1, -1):
+                self.spi.write(mv[j * row:(j + 1) * row])
+        self.digital_write(self.cs_pin, 1)
+
+    def stream_rows(self, row):
+        """Repeat one band-sized buffer across the whole RAM (used by Clear)."""
+        self.digital_write(self.dc_pin, 1)
+        self.digital_write(self.cs_pin, 0)
+        for _ in range(self.width // 8):
+            self.spi.write(row)
+        self.digital_write(self.cs_pin, 1)
+
+    def ram_stream(self, command=0x24):
+        """Start a RAM write fed piece by piece through the returned RamStream."""
+        if not self.native_order:
+            raise RuntimeError("streaming a frame to RAM needs native_order")
+        return RamStream(self, command)
+
+    def run_script(self, script):
+        """Replay a command script built with build_script()."""
+        mv = memoryview(script)
+        i = 0
+        end = len(script)
+        while i < end:
+            self.send_command(script[i])
+            length = script[i + 1]
+            flags = script[i + 2]
+            i += 3
+            if length:
+                self.send_buffer(mv[i:i + length])
+                i += length
+            if flags & WAIT_BUSY:
+                self.ReadBusy()
+
+    def is_busy(self):
+        return self.digital_read(self.busy_pin) == 1    #  0: idle, 1: busy
+
+    def _busy_irq(self, pin):
+        self._busy_released = True
+        if self._busy_flag is not None:
+            self._busy_flag.set()
+
+    def ReadBusy(self, timeout_ms=BUSY_TIMEOUT_MS):
+        """
+        Wait for BUSY to be released.
+
+        The CPU idles between interrupts instead of polling; a falling-edge
+        IRQ on the BUSY pin ends the wait.
+
+        Raises:
+            RuntimeError: If the panel is still busy after timeout_ms.
+        """
+        if self.verbose:
+            print("e-Paper busy")
+        self._busy_released = False
+        self.busy_pin.irq(trigger=Pin.IRQ_FALLING, handler=self._busy_handler)
+        try:
+            start = utime.ticks_ms()
+            while self.is_busy() and not self._busy_released:
+                if utime.ticks_diff(utime.ticks_ms(), start) > timeout_ms:
+                    raise RuntimeError("e-Paper busy timeout")
+                idle()
+        finally:
+            self.busy_pin.irq(handler=None)
+        if self.verbose:
+            print("e-Paper busy release")
+
+    async def wait_busy(self, timeout_ms=BUSY_TIMEOUT_MS):
+        """
+        Awaitable version of ReadBusy() so other tasks run during a refresh.
+
+        Raises:
+            asyncio.TimeoutError: If the panel is still busy after timeout_ms.
+        """
+        if self._busy_flag is None:
+            self._busy_flag = asyncio.ThreadSafeFlag()
+        self._busy_flag.clear()
+        self.busy_pin.irq(trigger=Pin.IRQ_FALLING, handler=self._busy_handler)
+        try:
+            if self.is_busy():
+                await asyncio.wait_for(self._busy_flag.wait(), timeout_ms / 1000)
+        finally:
+            self.busy_pin.irq(handler=None)
+
+    def TurnOnDisplay(self, wait=True):
         self.send_command(0x22) # DISPLAY_UPDATE_CONTROL_2
         self.send_data(0xC7)
         self.send_command(0x20) # MASTER_ACTIVATION
-        self.ReadBusy()
+        if wait:
+            self.ReadBusy()
 
-    def TurnOnDisplay_Partial(self):
+    def TurnOnDisplay_Partial(self, wait=True):
         self.send_command(0x22) # DISPLAY_UPDATE_CONTROL_2
         self.send_data(0x0F)
         self.send_command(0x20) # MASTER_ACTIVATION
-        self.ReadBusy()
+        if wait:
+            self.ReadBusy()
 
     def lut(self, lut):
         self.send_command(0x32)
@@ -143,135 +345,156 @@ class EPD_2in9_Landscape(framebuf.FrameBuffer):
         self.ReadBusy()
 
     def SetLut(self, lut):
-        self.lut(lut)
-        self.send_command(0x3f)
-        self.send_data(lut[153])
-        self.send_command(0x03)     # gate voltage
-        self.send_data(lut[154])
-        self.send_command(0x04)     # source voltage
-        self.send_data(lut[155])    # VSH
-        self.send_data(lut[156])    # VSH2
-        self.send_data(lut[157])    # VSL
-        self.send_command(0x2c)        # VCOM
-        self.send_data(lut[158])
+        if lut is self.loaded_lut:
+            return
+        if lut is self.full_lut:
+            self.run_script(FULL_LUT_SCRIPT)
+        elif lut is self.partial_lut:
+            self.run_script(PARTIAL_LUT_SCRIPT)
+        else:
+            self.run_script(lut_script(lut))
+        self.loaded_lut = lut
 
     def SetWindow(self, x_start, y_start, x_end, y_end):
+        scratch = self._scratch
         self.send_command(0x44) # SET_RAM_X_ADDRESS_START_END_POSITION
         # x point must be the multiple of 8 or the last 3 bits will be ignored
-        self.send_data((x_start>>3) & 0xFF)
-        self.send_data((x_end>>3) & 0xFF)
+        scratch[0] = (x_start>>3) & 0xFF
+        scratch[1] = (x_end>>3) & 0xFF
+        self.send_buffer(self._scratch_mv[0:2])
         self.send_command(0x45) # SET_RAM_Y_ADDRESS_START_END_POSITION
-        self.send_data(y_start & 0xFF)
-        self.send_data((y_start >> 8) & 0xFF)
-        self.send_data(y_end & 0xFF)
-        self.send_data((y_end >> 8) & 0xFF)
+        scratch[0] = y_start & 0xFF
+        scratch[1] = (y_start >> 8) & 0xFF
+        scratch[2] = y_end & 0xFF
+        scratch[3] = (y_end >> 8) & 0xFF
+        self.send_buffer(self._scratch_mv[0:4])
 
     def SetCursor(self, x, y):
+        scratch = self._scratch
         self.send_command(0x4E) # SET_RAM_X_ADDRESS_COUNTER
         self.send_data(x & 0xFF)
         
         self.send_command(0x4F) # SET_RAM_Y_ADDRESS_COUNTER
-        self.send_data(y & 0xFF)
-        self.send_data((y >> 8) & 0xFF)
+        scratch[0] = y & 0xFF
+        scratch[1] = (y >> 8) & 0xFF
+        self.send_buffer(self._scratch_mv[0:2])
         self.ReadBusy()
         
+    def SetFullWindow(self):
+        # In native order RAM X runs from the last byte column down to 0
+        if self.native_order:
+            self.SetWindow(self.width - 1, 0, 0, self.height - 1)
+            self.SetCursor(self.width // 8 - 1, 0)
+        else:
+            self.SetWindow(0, 0, self.width - 1, self.height - 1)
+            self.SetCursor(0, 0)
+
+    def configure(self):
+        self.ReadBusy()
+        self.run_script(CONFIG_NATIVE_SCRIPT if self.native_order else CONFIG_SCAN_SCRIPT)
+        self.SetFullWindow()
+        self.loaded_lut = None  # a reset clears the waveform registers
+
     def init(self):
         # EPD hardware init start     
+        cold = self.state == PANEL_COLD
         self.reset()
 
         self.ReadBusy()   
-        self.send_command(0x12)  #SWRESET
-        self.ReadBusy()   
-
-        self.send_command(0x01) #Driver output control      
-        self.send_data(0x27)
-        self.send_data(0x01)
-        self.send_data(0x00)
-    
-        self.send_command(0x11) #data entry mode       
-        self.send_data(0x07)
-
-        self.SetWindow(0, 0, self.width-1, self.height-1)
-
-        self.send_command(0x21) #  Display update control
-        self.send_data(0x00)
-        self.send_data(0x80)
-    
-        self.SetCursor(0, 0)
-        self.ReadBusy()
+        if cold:
+            self.run_script(SWRESET_SCRIPT)
+        self.configure()
 
         self.SetLut(self.full_lut)
+        self.partial_mode = False
+        self.state = PANEL_READY
         # EPD hardware init end
         return 0
 
-    def display(self, image):
+    def wake(self):
+        """
+        Make the panel ready for a full refresh, doing only the work its
+        current state requires: nothing if already configured with the full
+        waveform, a hardware reset and reconfigure from deep sleep or partial
+        mode, and the complete SWRESET sequence only from cold.
+        """
+        if self.state == PANEL_READY and not self.partial_mode:
+            return
+        self.init()
+
+    # With wait=False the refresh runs in the background; call ReadBusy() or
+    # await wait_busy() before talking to the panel again.
+    def display(self, image, wait=True):
         if (image == None):
             return            
-        self.send_command(0x24) # WRITE_RAM
-        for j in range(int(self.width / 8) - 1, -1, -1):
-            for i in range(0, self.height):
-                self.send_data(image[i + j * self.height])   
-        self.TurnOnDisplay()
+        self.write_ram(0x24, image) # WRITE_RAM
+        self.TurnOnDisplay(wait)
 
-    def display_Base(self, image):
+    def display_Base(self, image, wait=True):
         if (image == None):
             return   
-        self.send_command(0x24) # WRITE_RAM
-        for j in range(int(self.width / 8) - 1, -1, -1):
-            for i in range(0, self.height):
-                self.send_data(image[i + j * self.height])    
-                
-        self.send_command(0x26) # WRITE_RAM
-        for j in range(int(self.width / 8) - 1, -1, -1):
-            for i in range(0, self.height):
-                self.send_data(image[i + j * self.height])      
-                
-        self.TurnOnDisplay()
+        self.write_ram(0x24, image) # WRITE_RAM
+        self.write_ram(0x26, image) # WRITE_RAM (previous image)
+        self.TurnOnDisplay(wait)
 
-    def display_Partial(self, image):
+    def display_Partial(self, image, wait=True):
         if (image == None):
             return
             
-        self.digital_write(self.reset_pin, 0)
-        self.delay_ms(2)
-        self.digital_write(self.reset_pin, 1)
-        self.delay_ms(2)   
+        self.begin_partial()
+        self.SetFullWindow()
+        self.write_ram(0x24, image) # WRITE_RAM
+        self.TurnOnDisplay_Partial(wait)
+
+    def begin_partial(self):
+        """Load the partial waveform; stays active until the next init()/wake()."""
+        if self.partial_mode and self.state == PANEL_READY:
+            return
+        self.reset()
+        self.configure()
         self.SetLut(self.partial_lut)
-        self.send_command(0x37) 
-        self.send_data(0x00)  
-        self.send_data(0x00)  
-        self.send_data(0x00)  
-        self.send_data(0x00) 
-        self.send_data(0x00)  
-        self.send_data(0x40)  
-        self.send_data(0x00)  
-        self.send_data(0x00)   
-        self.send_data(0x00)  
-        self.send_data(0x00)
-        self.send_command(0x3C) #BorderWaveform
-        self.send_data(0x80)
-        self.send_command(0x22) 
-        self.send_data(0xC0)   
-        self.send_command(0x20) 
-        self.ReadBusy()
-        self.SetWindow(0, 0, self.width - 1, self.height - 1)
-        self.SetCursor(0, 0)
-        self.send_command(0x24) # WRITE_RAM
-        for j in range(int(self.width / 8) - 1, -1, -1):
-            for i in range(0, self.height):
-                self.send_data(image[i + j * self.height])    
-        self.TurnOnDisplay_Partial()
+        self.run_script(PARTIAL_SETUP_SCRIPT)
+        self.partial_mode = True
+        self.state = PANEL_READY
+
+    def write_window(self, command, image, band_start, band_end, col_start, col_end):
+        """Write a rectangle of the framebuffer into panel RAM.
+
+        band_start..band_end are 8-pixel landscape rows (byte rows of the
+        MONO_VLSB buffer), col_start..col_end landscape columns, all inclusive.
+        """
+        bands = self.width // 8
+        row = self.height
+        if self.native_order:
+            self.SetWindow((bands - 1 - band_start) * 8, col_start, (bands - 1 - band_end) * 8, col_end)
+            self.SetCursor(bands - 1 - band_start, col_start)
+            order = range(band_start, band_end + 1)
+        else:
+            self.SetWindow((bands - 1 - band_end) * 8, col_start, (bands - 1 - band_start) * 8, col_end)
+            self.SetCursor(bands - 1 - band_end, col_start)
+            order = range(band_end, band_start - 1, -1)
+        mv = memoryview(image)
+        self.send_command(command)
+        self.digital_write(self.dc_pin, 1)
+        self.digital_write(self.cs_pin, 0)
+        for j in order:
+            self.spi.write(mv[j * row + col_start:j * row + col_end + 1])
+        self.digital_write(self.cs_pin, 1)
 
     def Clear(self, color):
+        row = bytearray([color]) * self.height
         self.send_command(0x24) # WRITE_RAM
-        self.send_data1([color] * self.height * int(self.width / 8))
+        self.stream_rows(row)
         self.send_command(0x26) # WRITE_RAM
-        self.send_data1([color] * self.height * int(self.width / 8))
+        self.stream_rows(row)
         self.TurnOnDisplay()
 
     def sleep(self):
+        self.ReadBusy()
         self.send_command(0x10) # DEEP_SLEEP_MODE
-        self.send_data(0x01)
+        self.send_data(0x01)     # mode 1 keeps panel RAM for the next partial refresh
         
-        self.delay_ms(2000)
         self.module_exit()
+        self.state = PANEL_SLEEP
+        self.partial_mode = False
+        self.loaded_lut = None
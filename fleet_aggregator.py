@@ -0,0 +1,197 @@
+"""
+fleet_aggregator.py: Poll the Satori upstream APIs once for a whole fleet
+of SatoriScreens and serve each screen a 64-byte fleet_record.
+
+Every screen normally fetches cryptoscope, satorinet.io and the price
+sources itself. With the aggregator, the upstreams are polled once per
+interval for the union of all addresses the screens asked for (addresses
+shared by several screens are fetched once), and a screen makes a single
+plain-HTTP request:
+
+    GET /record?addresses=ADDR1,ADDR2,...
+
+The reply is a fleet_record (application/octet-stream) with the totals of
+those addresses, the price and the neuron stats. Addresses seen for the
+first time are fetched before answering; ones no screen has asked for in
+ACTIVE_WINDOW seconds are dropped.
+
+Runs under CPython 3.8+ next to http_client.py, json_stream.py,
+satori_api.py, price_sources.py and fleet_record.py, sharing the screen's
+endpoints and parsing:
+
+    python fleet_aggregator.py --port 8080 --interval 300
+
+To point a screen at it, put the base URL (e.g. http://192.168.1.10:8080)
+in a file named AGGREGATOR on the Pico.
+"""
+
+import argparse
+import asyncio
+import time
+from urllib.parse import parse_qs, urlsplit
+
+import fleet_record
+import http_client
+import price_sources
+import satori_api
+from satori_api import ADDRESS_URL, NEURONS_URL, ASSETS
+
+POLL_INTERVAL = 300          # seconds between upstream polls
+NEURONS_TTL = 6 * 3600       # the neuron report is regenerated daily
+ACTIVE_WINDOW = 3 * 3600     # forget addresses no screen asked for in this long
+FIRST_FETCH_TIMEOUT = 20     # how long a screen waits for never-seen addresses
+CONCURRENCY = 8              # address lookups in flight at once
+
+
+class Aggregator:
+    def __init__(self, interval=POLL_INTERVAL, concurrency=CONCURRENCY):
+        self.interval = interval
+        self.concurrency = concurrency
+        self.pool = http_client.ConnectionPool(concurrency)
+        self.balances = {}      # address -> (balance, {asset: amount})
+        self.last_asked = {}    # address -> time a screen last asked for it
+        self.inflight = {}      # address -> task fetching it right now
+        self.neurons = None
+        self.neurons_time = 0
+        self.price = None
+        self.updated = 0
+        # path -> async handler(addresses) returning the response body
+        self.routes = {"/record": self.record}
+
+    async def fetch_address(self, address):
+        fields = satori_api.address_extractor()
+        try:
+            response = await http_client.get(ADDRESS_URL + address, pool=self.pool, consumer=fields)
+            if response.status_code != 200:
+                raise ValueError(f"HTTP {response.status_code}")
+        except Exception as e:
+            # Keep serving the previous balance, if any
+            print(f"Error fetching address {address}: {e!r}")
+            return
+        self.balances[address] = satori_api.parse_address(fields)
+
+    def refresh_address(self, address):
+        """Start fetching `address` unless a fetch is already running; returns its task."""
+        task = self.inflight.get(address)
+        if task is None:
+            task = asyncio.ensure_future(self.fetch_address(address))
+            self.inflight[address] = task
+            task.add_done_callback(lambda _: self.inflight.pop(address, None))
+        return task
+
+    async def fetch_neurons(self):
+        fields = satori_api.neurons_extractor()
+        try:
+            response = await http_client.get(NEURONS_URL, headers={"Accept": "application/json"},
+                                              pool=self.pool, consumer=fields)
+            if response.status_code != 200:
+                raise ValueError(f"HTTP {response.status_code}")
+        except Exception as e:
+            print(f"Error fetching neurons data: {e!r}")
+            return
+        self.neurons = satori_api.parse_neurons(fields)
+        self.neurons_time = time.time()
+
+    async def fetch_price(self):
+        result = await price_sources.first_price(price_sources.PRICE_SOURCES, self.pool)
+        if result:
+            self.price = result[1]
+
+    async def refresh_all(self):
+        now = time.time()
+        for address in list(self.last_asked):
+            if now - self.last_asked[address] > ACTIVE_WINDOW:
+                del self.last_asked[address]
+                self.balances.pop(address, None)
+        pending = list(self.last_asked)
+
+        async def worker():
+            while pending:
+                await self.refresh_address(pending.pop())
+
+        jobs = [worker() for _ in range(min(self.concurrency, len(pending)))]
+        jobs.append(self.fetch_price())
+        if now - self.neurons_time >= NEURONS_TTL:
+            jobs.append(self.fetch_neurons())
+        await asyncio.gather(*jobs)
+        self.updated = time.time()
+        print(f"Refreshed {len(self.last_asked)} address(es), price {self.price}, "
+              f"{self.pool.handshakes} connection(s) opened so far")
+
+    async def poll_forever(self):
+        while True:
+            started = time.time()
+            try:
+                await self.refresh_all()
+            except Exception as e:
+                print(f"Poll failed: {e!r}")
+            await asyncio.sleep(max(0, self.interval - (time.time() - started)))
+
+    async def record(self, addresses):
+        """Build the fleet_record for one screen's `addresses`."""
+        now = time.time()
+        for address in addresses:
+            self.last_asked[address] = now
+        unknown = [self.refresh_address(a) for a in addresses if a not in self.balances]
+        if unknown:
+            await asyncio.wait(unknown, timeout=FIRST_FETCH_TIMEOUT)
+
+        balance_data = None
+        if addresses:
+            total_balance = 0.0
+            total_assets = {asset: 0.0 for asset in ASSETS}
+            missing = 0
+            for address in addresses:
+                if address not in self.balances:
+                    missing += 1
+                    continue
+                balance, amounts = self.balances[address]
+                total_balance += balance
+                for asset in amounts:
+                    total_assets[asset] += amounts[asset]
+            balance_data = {"balance": total_balance, "assets": total_assets, "missing": missing}
+        return fleet_record.pack(balance_data, self.neurons, self.price, self.updated)
+
+    async def handle(self, reader, writer):
+        try:
+            request_line = await reader.readline()
+            # Bodies go out uncompressed whatever Accept-Encoding says: inflating
+            # a gzip frame on the Pico needs a 32 KB window, seven times the frame
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            parts = request_line.decode("latin-1").split()
+            url = urlsplit(parts[1]) if len(parts) >= 2 else None
+            handler = self.routes.get(url.path) if url and parts[0] == "GET" else None
+            if handler is None:
+                status, body, content_type = "404 Not Found", b"not found\n", "text/plain"
+            else:
+                query = parse_qs(url.query)
+                addresses = [a for a in ",".join(query.get("addresses", [])).split(",") if a]
+                status, body, content_type = "200 OK", await handler(addresses), "application/octet-stream"
+            writer.write((f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                          f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n").encode() + body)
+            await writer.drain()
+        except Exception as e:
+            print(f"Error serving request: {e!r}")
+        finally:
+            writer.close()
+
+
+async def serve(aggregator, host, port):
+    server = await asyncio.start_server(aggregator.handle, host, port)
+    print(f"Fleet aggregator listening on {host}:{port}, polling every {aggregator.interval}s")
+    async with server:
+        await asyncio.gather(server.serve_forever(), aggregator.poll_forever())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve compact SatoriScreen records from one shared upstream poll.")
+    parser.add_argument("--host", default="0.0.0.0", help="Address to listen on (default 0.0.0.0).")
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on (default 8080).")
+    parser.add_argument("--interval", type=int, default=POLL_INTERVAL, help="Seconds between upstream polls.")
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY, help="Address lookups in flight at once.")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(Aggregator(args.interval, args.concurrency), args.host, args.port))
+    except KeyboardInterrupt:
+        pass
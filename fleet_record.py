@@ -0,0 +1,90 @@
+# fleet_record.py
+#
+# Fixed-layout binary record served by fleet_aggregator.py to each screen.
+# Shared by the aggregator (CPython) and the device (MicroPython), so the
+# layout is defined in exactly one place.
+
+import struct
+
+RECORD_VERSION = 1
+# version, flags, missing addresses, updated (unix time),
+# EVR balance, SATORI, LOLLIPOP, price, stake requirement,
+# competing neurons, neuron version (UTF-8, NUL padded)
+RECORD_FORMAT = "<BBHIddddfI16s"
+RECORD_SIZE = struct.calcsize(RECORD_FORMAT)  # 64 bytes
+
+# Flags: which parts of the record hold real data
+HAS_BALANCE = 0x01
+HAS_NEURONS = 0x02
+HAS_PRICE = 0x04
+
+
+def _fit_utf8(text, size):
+    """`text` as UTF-8, shortened by whole characters until it fits in `size` bytes."""
+    data = text.encode()
+    while len(data) > size:
+        text = text[:-1]
+        data = text.encode()
+    return data
+
+
+def pack(balance_data, neurons_data, satori_price, updated=0):
+    """
+    Build a record from the same values DisplayService.fetch_all() returns;
+    any of them may be None.
+    """
+    flags = 0
+    balance = satori = lollipop = 0.0
+    missing = 0
+    if balance_data:
+        flags |= HAS_BALANCE
+        balance = balance_data.get("balance", 0.0)
+        satori = balance_data["assets"].get("SATORI", 0.0)
+        lollipop = balance_data["assets"].get("LOLLIPOP", 0.0)
+        missing = balance_data.get("missing", 0)
+    stake = 0.0
+    competing = 0
+    version = b""
+    if neurons_data:
+        flags |= HAS_NEURONS
+        stake = neurons_data["current_stake_requirement"]
+        competing = neurons_data["competing_neurons"]
+        version = _fit_utf8(str(neurons_data["current_neuron_version"]), 16)
+    price = 0.0
+    if satori_price is not None:
+        flags |= HAS_PRICE
+        price = satori_price
+    return struct.pack(RECORD_FORMAT, RECORD_VERSION, flags, min(missing, 0xFFFF), int(updated),
+                       balance, satori, lollipop, price, stake, competing, version)
+
+
+def unpack(record):
+    """
+    Decode a record into (balance_data, neurons_data, satori_price, updated).
+
+    Raises:
+        ValueError: If the record has the wrong size or version.
+    """
+    if len(record) != RECORD_SIZE:
+        raise ValueError(f"record is {len(record)} bytes, expected {RECORD_SIZE}")
+    (version, flags, missing, updated, balance, satori, lollipop, price,
+     stake, competing, neuron_version) = struct.unpack(RECORD_FORMAT, record)
+    if version != RECORD_VERSION:
+        raise ValueError(f"unsupported record version {version}")
+    balance_data = None
+    if flags & HAS_BALANCE:
+        balance_data = {
+            "balance": balance,
+            "assets": {"SATORI": satori, "LOLLIPOP": lollipop},
+            "missing": missing,
+        }
+    neurons_data = None
+    if flags & HAS_NEURONS:
+        end = neuron_version.find(b"\x00")
+        neurons_data = {
+            "current_stake_requirement": stake,
+            "current_neuron_version": (neuron_version if end < 0 else neuron_version[:end]).decode(),
+            "competing_neurons": competing,
+        }
+    satori_price = price if flags & HAS_PRICE else None
+    return balance_data, neurons_data, satori_price, updated
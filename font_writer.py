@@ -0,0 +1,72 @@
+import framebuf
+
+
+class FontWriter:
+    """
+    Draw text with the proportional fonts downloaded by the updater
+    (arial10, arial_50, courier20, font10, font6, freesans20).
+
+    The font modules are generated by font_to_py: get_ch() returns a
+    memoryview of the glyph bitmap plus its height and width. Each glyph is
+    wrapped in a FrameBuffer and blitted in one call through a two-entry
+    palette, so set bits become `color` and clear bits stay transparent.
+    """
+
+    def __init__(self, framebuf_obj, font, color=0):
+        """
+        Args:
+            framebuf_obj: Target FrameBuffer (e.g. the EPD instance).
+            font: An imported font_to_py font module.
+            color (int): Ink colour (0 = black on the ePaper).
+        """
+        self.fb = framebuf_obj
+        self.font = font
+        if font.hmap():
+            self.map = framebuf.MONO_HMSB if font.reverse() else framebuf.MONO_HLSB
+            glyph_bytes = ((font.max_width() + 7) // 8) * font.height()
+        else:
+            self.map = framebuf.MONO_VLSB
+            glyph_bytes = ((font.height() + 7) // 8) * font.max_width()
+        # Font data is read-only bytes; if the FrameBuffer cannot wrap it
+        # directly, glyphs are copied into this one reusable buffer instead.
+        self._scratch = bytearray(glyph_bytes)
+        self._zero_copy = True
+        self._palette = framebuf.FrameBuffer(bytearray(1), 2, 1, framebuf.MONO_HLSB)
+        self.set_color(color)
+
+    def set_color(self, color):
+        self.color = color
+        self._key = 1 - color
+        self._palette.pixel(0, 0, self._key)
+        self._palette.pixel(1, 0, color)
+
+    def height(self):
+        return self.font.height()
+
+    def text_width(self, text):
+        """Width in pixels of `text` when drawn with this font."""
+        width = 0
+        for char in text:
+            width += self.font.get_ch(char)[2]
+        return width
+
+    def _glyph_fb(self, glyph, width, height):
+        if self._zero_copy:
+            try:
+                return framebuf.FrameBuffer(glyph, width, height, self.map)
+            except (TypeError, ValueError):
+                self._zero_copy = False
+        self._scratch[:len(glyph)] = glyph
+        return framebuf.FrameBuffer(self._scratch, width, height, self.map)
+
+    def draw_text(self, text, x, y):
+        """Draw `text` with its top-left corner at (x, y); returns the end x."""
+        for char in text:
+            glyph, height, width = self.font.get_ch(char)
+            self.fb.blit(self._glyph_fb(glyph, width, height), x, y, self._key, self._palette)
+            x += width
+        return x
+
+    def draw_text_right(self, text, right, y):
+        """Draw `text` so that it ends at x = right."""
+        return self.draw_text(text, right - self.text_width(text), y)
@@ -0,0 +1,162 @@
+"""
+framebuf_emu.py: NumPy-backed stand-in for MicroPython's framebuf module, so
+the on-device layout code (DisplayService.update_display, ScaledText,
+FontWriter) can render frames on a host.
+
+Only the monochrome formats and the drawing calls the layout uses are
+implemented: fill, pixel, hline, vline, rect, fill_rect, text and blit
+(with key and palette). Their clipping and colour rules follow
+extmod/modframebuf.c, so a frame rendered here is byte-for-byte what the
+Pico would draw.
+
+Pixels live in a NumPy array; the backing buffer is only packed when
+sync() is called. Do not modify a buffer behind a FrameBuffer's back.
+
+text() needs MicroPython's built-in 8x8 font, which is not shipped here:
+call load_font() with extmod/font_petme128_8x8.h from a MicroPython
+checkout (or a raw 768-byte dump of it), or set FRAMEBUF_FONT to its path.
+
+    import sys, framebuf_emu
+    sys.modules["framebuf"] = framebuf_emu
+"""
+
+import os
+import re
+
+import numpy as np
+
+MONO_VLSB = 0
+MONO_HLSB = 3
+MONO_HMSB = 4
+MVLSB = MONO_VLSB
+
+FONT_SIZE = 96 * 8  # characters 32..127, 8 column bytes each
+
+_font = None
+
+
+def load_font(path):
+    """Load the petme128 8x8 font from its C header or a raw 768-byte file."""
+    global _font
+    with open(path, "rb") as file:
+        data = file.read()
+    if len(data) != FONT_SIZE:
+        # C header: take every hex byte inside the array initialiser
+        body = data[data.index(b"{") + 1:data.rindex(b"}")]
+        body = re.sub(rb"//[^\n]*|/\*.*?\*/", b"", body, flags=re.S)
+        data = bytes(int(v, 16) for v in re.findall(rb"0x([0-9a-fA-F]{2})", body))
+    if len(data) != FONT_SIZE:
+        raise ValueError(f"{path}: expected {FONT_SIZE} font bytes, found {len(data)}")
+    _font = np.unpackbits(np.frombuffer(data, np.uint8).reshape(96, 8, 1), axis=2, bitorder="little")
+    _font = _font.transpose(0, 2, 1).copy()   # [char, y, x]
+
+
+if os.environ.get("FRAMEBUF_FONT"):
+    load_font(os.environ["FRAMEBUF_FONT"])
+
+
+class FrameBuffer:
+    def __init__(self, buffer, width, height, format, stride=None):
+        if format not in (MONO_VLSB, MONO_HLSB, MONO_HMSB):
+            raise ValueError("only monochrome formats are emulated")
+        self._buffer = buffer
+        self._width = width
+        self._height = height
+        self._format = format
+        stride = width if stride is None else stride
+        if format != MONO_VLSB:
+            stride = (stride + 7) & ~7
+        self._stride = stride
+        raw = np.frombuffer(buffer, np.uint8)
+        # Decoded whole, padding included, so sync() leaves the bits outside
+        # width x height as they were; pixels is the visible window of it.
+        if format == MONO_VLSB:
+            bands = (height + 7) // 8
+            bits = np.unpackbits(raw[:bands * stride].reshape(bands, stride, 1), axis=2, bitorder="little")
+            self._bits = bits.transpose(0, 2, 1).reshape(bands * 8, stride).copy()
+        else:
+            rows = raw[:height * stride // 8].reshape(height, stride // 8)
+            self._bits = np.unpackbits(rows, axis=1, bitorder=self._bit_order())
+        self.pixels = self._bits[:height, :width]
+
+    def _bit_order(self):
+        return "big" if self._format == MONO_HLSB else "little"
+
+    def sync(self):
+        """Pack the pixels back into the buffer passed to the constructor."""
+        if self._format == MONO_VLSB:
+            bands = self._bits.shape[0] // 8
+            packed = np.packbits(self._bits.reshape(bands, 8, self._stride).transpose(0, 2, 1),
+                                 axis=2, bitorder="little")
+        else:
+            packed = np.packbits(self._bits, axis=1, bitorder=self._bit_order())
+        data = packed.tobytes()
+        self._buffer[:len(data)] = data
+        return self._buffer
+
+    def fill(self, c):
+        self.pixels[:] = 1 if c else 0
+
+    def pixel(self, x, y, c=None):
+        if not (0 <= x < self._width and 0 <= y < self._height):
+            return None
+        if c is None:
+            return int(self.pixels[y, x])
+        self.pixels[y, x] = 1 if c else 0
+
+    def fill_rect(self, x, y, w, h, c):
+        if h < 1 or w < 1 or x + w <= 0 or y + h <= 0 or y >= self._height or x >= self._width:
+            return
+        x_end = min(self._width, x + w)
+        y_end = min(self._height, y + h)
+        self.pixels[max(y, 0):y_end, max(x, 0):x_end] = 1 if c else 0
+
+    def hline(self, x, y, w, c):
+        self.fill_rect(x, y, w, 1, c)
+
+    def vline(self, x, y, h, c):
+        self.fill_rect(x, y, 1, h, c)
+
+    def rect(self, x, y, w, h, c, f=False):
+        if f:
+            self.fill_rect(x, y, w, h, c)
+        else:
+            self.fill_rect(x, y, w, 1, c)
+            self.fill_rect(x, y + h - 1, w, 1, c)
+            self.fill_rect(x, y, 1, h, c)
+            self.fill_rect(x + w - 1, y, 1, h, c)
+
+    def text(self, s, x, y, c=1):
+        if _font is None:
+            raise RuntimeError("framebuf_emu: 8x8 font not loaded, see load_font()")
+        value = 1 if c else 0
+        for ch in str(s).encode():
+            if ch < 32 or ch > 127:
+                ch = 127
+            x0 = max(x, 0)
+            x1 = min(x + 8, self._width)
+            y0 = max(y, 0)
+            y1 = min(y + 8, self._height)
+            if x0 < x1 and y0 < y1:
+                glyph = _font[ch - 32, y0 - y:y1 - y, x0 - x:x1 - x]
+                self.pixels[y0:y1, x0:x1][glyph.astype(bool)] = value
+            x += 8
+
+    def blit(self, fbuf, x, y, key=-1, palette=None):
+        if x >= self._width or y >= self._height or -x >= fbuf._width or -y >= fbuf._height:
+            return
+        x0 = max(0, x)
+        y0 = max(0, y)
+        x1 = max(0, -x)
+        y1 = max(0, -y)
+        x0_end = min(self._width, x + fbuf._width)
+        y0_end = min(self._height, y + fbuf._height)
+        source = fbuf.pixels[y1:y1 + y0_end - y0, x1:x1 + x0_end - x0]
+        if palette is not None:
+            source = palette.pixels[0, :][source]
+        target = self.pixels[y0:y0_end, x0:x0_end]
+        if 0 <= key <= 255:
+            mask = source != key
+        else:
+            mask = np.ones(source.shape, bool)   # key -1: nothing is transparent
+        target[mask] = source[mask] != 0
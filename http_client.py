@@ -0,0 +1,402 @@
+# http_client.py
+#
+# Minimal asyncio HTTP(S) GET client for MicroPython (also runs under CPython).
+# urequests blocks the whole program for every request; this lets the
+# DisplayService run its upstream fetches concurrently on non-blocking sockets.
+# A ConnectionPool keeps HTTP/1.1 connections alive per host, so a cycle pays
+# for one TCP + TLS handshake per upstream host instead of one per request.
+# Each connection reads with readinto() into one preallocated arena and hands
+# memoryview slices of it to the body consumer, so a request has a fixed
+# memory ceiling and repeated cycles do not fragment the heap.
+# Responses are requested gzip/deflate-compressed where they can be inflated
+# as they stream in, to keep the radio on for fewer bytes.
+
+try:
+    import asyncio
+except ImportError:
+    import uasyncio as asyncio
+try:
+    import ujson as json
+except ImportError:
+    import json
+try:
+    import ssl
+except ImportError:
+    ssl = None
+# Only CPython's zlib inflates incrementally. MicroPython's deflate.DeflateIO
+# pulls from a stream, so it would need the whole compressed body in memory
+# plus the 32 KB window servers compress with, more than the uncompressed
+# responses cost; there nothing is advertised and bodies arrive as they are.
+try:
+    import zlib
+    _decompressobj = zlib.decompressobj
+except (ImportError, AttributeError):
+    _decompressobj = None
+ACCEPT_ENCODING = "gzip, deflate" if _decompressobj else None
+
+REQUEST_TIMEOUT = 15  # seconds, per request including connect and TLS handshake
+ARENA_SIZE = 2048     # per-connection read buffer; also the longest header line accepted
+
+
+class _Inflater:
+    """Decode a gzip, zlib-wrapped or raw deflate body and pass the output on to `sink`."""
+
+    def __init__(self, sink):
+        self.sink = sink
+        self.decoder = _decompressobj(47)   # 32 + 15: gzip or zlib header, auto-detected
+        self.started = False
+
+    def feed(self, chunk):
+        try:
+            data = self.decoder.decompress(chunk, ARENA_SIZE)
+        except zlib.error:
+            # "deflate" is meant to be zlib-wrapped, but some servers send it raw
+            if self.started:
+                raise
+            self.decoder = _decompressobj(-15)
+            data = self.decoder.decompress(chunk, ARENA_SIZE)
+        self.started = True
+        while data:
+            self.sink(data)
+            data = self.decoder.decompress(self.decoder.unconsumed_tail, ARENA_SIZE)
+
+    def close(self):
+        data = self.decoder.flush()
+        if data:
+            self.sink(data)
+
+
+class Response:
+    def __init__(self, status, headers, body, consumer=None):
+        self.status_code = status
+        self.headers = headers  # header names lower-cased
+        self.content = body     # b"" when the body was streamed to `consumer`
+        self.consumer = consumer
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8")
+
+    def json(self):
+        return json.loads(self.content)
+
+
+def parse_url(url):
+    """Split a URL into (scheme, host, port, path)."""
+    scheme, _, rest = url.partition("://")
+    host, slash, path = rest.partition("/")
+    path = slash + path if slash else "/"
+    port = 443 if scheme == "https" else 80
+    if ":" in host:
+        host, port = host.split(":", 1)
+        port = int(port)
+    return scheme, host, port, path
+
+
+class Connection:
+    def __init__(self, reader, writer, arena=None):
+        self.reader = reader
+        self.writer = writer
+        self.requests = 0
+        self.got_status = False
+        self.arena = arena or bytearray(ARENA_SIZE)
+        self.view = memoryview(self.arena)
+        # Unconsumed bytes are arena[start:end]; they may belong to the next
+        # response on a keep-alive connection, so they survive between requests
+        self.start = 0
+        self.end = 0
+        # MicroPython streams read straight into the arena; CPython's
+        # StreamReader has no readinto() and is copied in instead
+        self._readinto = hasattr(reader, "readinto")
+
+    async def close(self):
+        try:
+            self.writer.close()
+            await self.writer.wait_closed()
+        except OSError:
+            pass
+
+    async def _recv(self, view):
+        """Read at most len(view) bytes into `view`; 0 means end of stream."""
+        if self._readinto:
+            n = None
+            while n is None:    # TLS sockets report None until a full record is in
+                n = await self.reader.readinto(view)
+            return n
+        data = await self.reader.read(len(view))
+        view[:len(data)] = data
+        return len(data)
+
+    async def _fill(self):
+        """Append more socket data after arena[end]; returns the byte count."""
+        if self.start == self.end:
+            self.start = self.end = 0
+        elif self.end == len(self.arena):
+            # Slide a partial line back to the front (rare: only on long headers)
+            pending = self.end - self.start
+            self.arena[:pending] = self.arena[self.start:self.end]
+            self.start, self.end = 0, pending
+        n = await self._recv(self.view[self.end:])
+        self.end += n
+        return n
+
+    async def _readline(self):
+        """Return the next line (with its newline) as a view into the arena."""
+        arena = self.arena
+        i = self.start
+        while True:
+            end = self.end
+            while i < end:
+                if arena[i] == 0x0A:
+                    line = self.view[self.start:i + 1]
+                    self.start = i + 1
+                    return line
+                i += 1
+            if self.start == 0 and end == len(arena):
+                raise ValueError("HTTP line longer than arena")
+            i -= self.start
+            if not await self._fill():
+                line = self.view[self.start:self.end]
+                self.start = self.end
+                return line
+            i += self.start
+
+    async def _read_exactly(self, length, sink):
+        """Pass the next `length` body bytes to `sink` as arena views."""
+        while length > 0:
+            if self.start == self.end:
+                if not await self._fill():
+                    raise EOFError("connection closed mid-body")
+            n = min(length, self.end - self.start)
+            sink(self.view[self.start:self.start + n])
+            self.start += n
+            length -= n
+
+    async def _read_to_eof(self, sink):
+        while True:
+            if self.start < self.end:
+                sink(self.view[self.start:self.end])
+                self.start = self.end
+            if not await self._fill():
+                break
+
+    async def request(self, host, path, headers, keep_alive, consumer=None):
+        """Send one GET and read the complete response.
+
+        With a `consumer` (an object with feed(chunk), such as
+        json_stream.JsonExtractor) the body is passed on as memoryview slices
+        of the arena as it arrives instead of being collected. A slice is only
+        valid until feed() returns.
+
+        Returns:
+            tuple: (Response, reusable) where reusable says whether the
+            connection can carry another request.
+        """
+        lines = ["GET %s HTTP/1.1" % path, "Host: %s" % host,
+                 "Connection: %s" % ("keep-alive" if keep_alive else "close")]
+        if ACCEPT_ENCODING:
+            lines.append("Accept-Encoding: " + ACCEPT_ENCODING)
+        if headers:
+            for name in headers:
+                lines.append("%s: %s" % (name, headers[name]))
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode())
+        await self.writer.drain()
+        self.requests += 1
+
+        self.got_status = False
+        status_line = await self._readline()
+        if not status_line:
+            raise OSError("connection closed by server")
+        self.got_status = True
+        status = int(bytes(status_line).split(None, 2)[1])
+        response_headers = {}
+        while True:
+            line = await self._readline()
+            if len(line) <= 2:      # blank line (or EOF) ends the headers
+                break
+            name, _, value = bytes(line).decode().partition(":")
+            response_headers[name.strip().lower()] = value.strip()
+
+        parts = []
+        if consumer:
+            sink = consumer.feed
+        else:
+            sink = lambda chunk: parts.append(bytes(chunk))
+        inflater = None
+        encoding = response_headers.get("content-encoding", "identity").lower()
+        if encoding != "identity":
+            if not ACCEPT_ENCODING or encoding not in ("gzip", "deflate"):
+                raise ValueError("unsupported content-encoding: " + encoding)
+            inflater = _Inflater(sink)
+            sink = inflater.feed
+        reusable = keep_alive and response_headers.get("connection", "").lower() != "close"
+        if status in (204, 304) or 100 <= status < 200:
+            pass
+        elif response_headers.get("transfer-encoding", "").lower() == "chunked":
+            while True:
+                size = int(bytes(await self._readline()).split(b";")[0], 16)
+                if size == 0:
+                    # Skip trailers up to the blank line
+                    while len(await self._readline()) > 2:
+                        pass
+                    break
+                await self._read_exactly(size, sink)
+                await self._readline()
+        elif "content-length" in response_headers:
+            await self._read_exactly(int(response_headers["content-length"]), sink)
+        else:
+            # No framing: the body ends when the server closes the connection
+            await self._read_to_eof(sink)
+            reusable = False
+        if inflater:
+            inflater.close()
+        if consumer and hasattr(consumer, "close"):
+            consumer.close()
+        return Response(status, response_headers, b"".join(parts), consumer), reusable
+
+
+def _ssl_context():
+    """One client context shared by every TLS connection the pool opens."""
+    if ssl and hasattr(ssl, "create_default_context"):
+        return ssl.create_default_context()
+    return True
+
+
+async def _connect(scheme, host, port, ssl_context, arena=None):
+    reader, writer = await asyncio.open_connection(
+        host, port, ssl=ssl_context if scheme == "https" else None)
+    return Connection(reader, writer, arena)
+
+
+class _HostSlots:
+    def __init__(self, limit):
+        self.limit = limit
+        self.idle = []
+        self.open = 0
+        self.released = asyncio.Event()
+
+
+class ConnectionPool:
+    """
+    Keep-alive HTTP/1.1 connections keyed by (scheme, host, port).
+
+    At most `max_per_host` connections are opened to one host; further
+    requests wait for one to be released and reuse it. Call close() when
+    the cycle's requests are done (before WiFi is turned off).
+
+    TLS: all connections share one SSL context. Session tickets are not
+    resumed because neither MicroPython's ssl module nor asyncio's
+    open_connection() expose the session object; keep-alive is what
+    removes the repeated handshakes.
+
+    Read arenas of closed connections are kept and handed to the next
+    connection, so the pool allocates at most one arena per connection
+    that was ever open at the same time.
+    """
+
+    def __init__(self, max_per_host=1):
+        self.max_per_host = max_per_host
+        self.hosts = {}
+        self.handshakes = 0
+        self._ssl = None
+        self._arenas = []
+
+    async def _acquire(self, key):
+        slots = self.hosts.get(key)
+        if slots is None:
+            slots = self.hosts[key] = _HostSlots(self.max_per_host)
+        while True:
+            if slots.idle:
+                return slots, slots.idle.pop()
+            if slots.open < slots.limit:
+                slots.open += 1
+                return slots, None
+            slots.released.clear()
+            await slots.released.wait()
+
+    async def _release(self, slots, connection, reusable):
+        if reusable:
+            slots.idle.append(connection)
+        else:
+            slots.open -= 1
+            if connection:
+                await connection.close()
+                self._arenas.append(connection.arena)
+        slots.released.set()
+
+    async def request(self, url, headers=None, consumer=None, timeout=None):
+        """
+        `timeout` (seconds) covers connecting and the exchange only, not the
+        wait for a free connection, so queued requests keep their full budget.
+        """
+        scheme, host, port, path = parse_url(url)
+        slots, connection = await self._acquire((scheme, host, port))
+        held = [connection, False]  # connection in use, reusable
+        try:
+            exchange = self._exchange(held, scheme, host, port, path, headers, consumer)
+            if timeout is None:
+                return await exchange
+            return await asyncio.wait_for(exchange, timeout)
+        finally:
+            await self._release(slots, held[0], held[1])
+
+    async def _exchange(self, held, scheme, host, port, path, headers, consumer):
+        connection = held[0]
+        if connection:
+            try:
+                response, held[1] = await connection.request(host, path, headers, True, consumer)
+                return response
+            except (OSError, EOFError, ValueError, IndexError):
+                # Retry on a new connection only if the server dropped the
+                # idle one before answering; the consumer has seen nothing yet
+                if connection.got_status:
+                    raise
+                held[0] = None
+                await connection.close()
+                self._arenas.append(connection.arena)
+        if self._ssl is None:
+            self._ssl = _ssl_context()
+        arena = self._arenas.pop() if self._arenas else None
+        try:
+            held[0] = await _connect(scheme, host, port, self._ssl, arena)
+        except BaseException:   # includes the cancellation from a timeout
+            if arena is not None:
+                self._arenas.append(arena)
+            raise
+        self.handshakes += 1
+        response, held[1] = await held[0].request(host, path, headers, True, consumer)
+        return response
+
+    async def close(self):
+        for slots in self.hosts.values():
+            while slots.idle:
+                connection = slots.idle.pop()
+                await connection.close()
+                self._arenas.append(connection.arena)
+            slots.open = 0
+        self.hosts = {}
+
+
+async def _request(url, headers, consumer):
+    scheme, host, port, path = parse_url(url)
+    connection = await _connect(scheme, host, port, scheme == "https")
+    try:
+        response, _ = await connection.request(host, path, headers, False, consumer)
+        return response
+    finally:
+        await connection.close()
+
+
+async def get(url, headers=None, timeout=REQUEST_TIMEOUT, pool=None, consumer=None):
+    """
+    Fetch `url` without blocking other tasks, through `pool` if given.
+    The body is streamed into `consumer` when one is given.
+
+    Raises:
+        asyncio.TimeoutError: If the request takes longer than `timeout` seconds
+            (with a pool, not counting the wait for a free connection).
+        OSError: On connection errors.
+    """
+    if pool:
+        return await pool.request(url, headers, consumer, timeout)
+    return await asyncio.wait_for(_request(url, headers, consumer), timeout)
@@ -0,0 +1,234 @@
+# json_stream.py
+#
+# Incremental JSON field extractor. The response body is fed in chunks as it
+# arrives from the socket and only the requested key paths are kept, so the
+# full document (or a NaN-patched copy of it) never has to sit in RAM.
+
+try:
+    import ujson as json
+except ImportError:
+    import json
+
+# Parser states
+_VALUE = 0      # expecting a value
+_KEY = 1        # expecting an object key or '}'
+_COLON = 2      # expecting ':'
+_AFTER = 3      # expecting ',' or a closing bracket
+_STRING = 4     # inside a string
+_LITERAL = 5    # inside a number / true / false / null / NaN
+_SKIP = 6       # inside a container nobody asked for
+_RAW = 7        # inside a container that was asked for as a whole
+_DONE = 8
+
+_QUOTE = 0x22
+_BACKSLASH = 0x5C
+# Byte values as tuples: `int in bytes` is not supported on every MicroPython port
+_WHITESPACE = (0x20, 0x09, 0x0D, 0x0A)
+_DELIMITERS = (0x20, 0x09, 0x0D, 0x0A, 0x2C, 0x7D, 0x5D)
+
+_LITERALS = {
+    b"true": True,
+    b"false": False,
+    b"null": None,
+    b"NaN": None,
+    b"Infinity": None,
+    b"-Infinity": None,
+}
+
+
+def _literal(token):
+    token = bytes(token)
+    if token in _LITERALS:
+        return _LITERALS[token]
+    if b"." in token or b"e" in token or b"E" in token:
+        return float(token)
+    return int(token)
+
+
+def _string(token):
+    return json.loads(b'"' + token + b'"')
+
+
+class JsonExtractor:
+    """
+    Pull a set of key paths out of a JSON document fed in chunks.
+
+    Paths are tuples of object keys and array indexes, e.g.
+    ("assets", "SATORI"). A path that names an object or array returns it
+    parsed as a whole; everything outside the requested paths is scanned
+    but never stored. NaN / Infinity are read as None. No requested path
+    may be a prefix of another (e.g. ("a",) with ("a", "b")): a value is
+    either extracted whole or searched for deeper paths, not both.
+
+    Usage:
+        extractor = JsonExtractor([("balance",), ("assets", "SATORI")])
+        for chunk in chunks:
+            extractor.feed(chunk)
+        extractor.close()
+        extractor.get(("balance",), 0.0)
+    """
+
+    def __init__(self, paths):
+        self.wanted = set()
+        self.prefixes = set()
+        for path in paths:
+            path = tuple(path)
+            self.wanted.add(path)
+            for i in range(len(path)):
+                self.prefixes.add(path[:i])
+        for path in self.wanted:
+            if path in self.prefixes:
+                raise ValueError(f"path {path} is a prefix of another requested path")
+        self.results = {}
+        self._path = []         # key or index of the current value in each open container
+        self._objects = []      # True for an object, False for an array
+        self._state = _VALUE
+        self._token = bytearray()
+        self._capture = False
+        self._is_key = False
+        self._target = None
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    def get(self, path, default=None):
+        return self.results.get(tuple(path), default)
+
+    def _start_value(self, c):
+        path = tuple(self._path)
+        wanted = path in self.wanted
+        self._target = path
+        if c == 0x7B or c == 0x5B:      # { [
+            if wanted:
+                self._state = _RAW
+                self._token = bytearray((c,))
+                self._depth = 1
+                self._in_string = self._escape = False
+            elif path in self.prefixes:
+                is_object = c == 0x7B
+                self._objects.append(is_object)
+                self._path.append(None if is_object else 0)
+                self._state = _KEY if is_object else _VALUE
+            else:
+                self._state = _SKIP
+                self._depth = 1
+                self._in_string = self._escape = False
+        elif c == _QUOTE:
+            self._state = _STRING
+            self._is_key = False
+            self._capture = wanted
+            self._escape = False
+            self._token = bytearray()
+        else:
+            self._state = _LITERAL
+            self._capture = wanted
+            self._token = bytearray((c,))
+
+    def _close_container(self):
+        self._objects.pop()
+        self._path.pop()
+        self._state = _AFTER if self._objects else _DONE
+
+    def _end_value(self):
+        self._state = _AFTER if self._objects else _DONE
+
+    def feed(self, data):
+        """Process the next chunk of the document (bytes, bytearray or memoryview)."""
+        for c in data:
+            state = self._state
+            if state == _SKIP or state == _RAW:
+                if state == _RAW:
+                    self._token.append(c)
+                if self._in_string:
+                    if self._escape:
+                        self._escape = False
+                    elif c == _BACKSLASH:
+                        self._escape = True
+                    elif c == _QUOTE:
+                        self._in_string = False
+                elif c == _QUOTE:
+                    self._in_string = True
+                elif c == 0x7B or c == 0x5B:
+                    self._depth += 1
+                elif c == 0x7D or c == 0x5D:
+                    self._depth -= 1
+                    if self._depth == 0:
+                        if state == _RAW:
+                            raw = bytes(self._token).replace(b"-Infinity", b"null")
+                            raw = raw.replace(b"Infinity", b"null").replace(b"NaN", b"null")
+                            self.results[self._target] = json.loads(raw)
+                            self._token = bytearray()
+                        self._end_value()
+            elif state == _STRING:
+                if self._escape:
+                    self._escape = False
+                    if self._capture:
+                        self._token.append(c)
+                elif c == _BACKSLASH:
+                    self._escape = True
+                    if self._capture:
+                        self._token.append(c)
+                elif c == _QUOTE:
+                    if self._is_key:
+                        self._path[-1] = _string(self._token)
+                        self._state = _COLON
+                    else:
+                        if self._capture:
+                            self.results[self._target] = _string(self._token)
+                        self._end_value()
+                elif self._capture:
+                    self._token.append(c)
+            elif state == _LITERAL:
+                if c in _DELIMITERS:
+                    if self._capture:
+                        self.results[self._target] = _literal(self._token)
+                    self._end_value()
+                    self._after(c)
+                else:
+                    self._token.append(c)
+            elif c in _WHITESPACE:
+                continue
+            elif state == _VALUE:
+                if c == 0x5D and self._objects and not self._objects[-1]:
+                    self._close_container()     # empty array
+                else:
+                    self._start_value(c)
+            elif state == _KEY:
+                if c == _QUOTE:
+                    self._state = _STRING
+                    self._is_key = True
+                    self._capture = True
+                    self._escape = False
+                    self._token = bytearray()
+                elif c == 0x7D:
+                    self._close_container()     # empty object
+                else:
+                    raise ValueError("expected object key")
+            elif state == _COLON:
+                if c != 0x3A:
+                    raise ValueError("expected ':'")
+                self._state = _VALUE
+            elif state == _AFTER:
+                self._after(c)
+
+    def _after(self, c):
+        if c in _WHITESPACE or self._state == _DONE:
+            return
+        if c == 0x2C:       # ,
+            if self._objects[-1]:
+                self._state = _KEY
+            else:
+                self._path[-1] += 1
+                self._state = _VALUE
+        elif c == 0x7D or c == 0x5D:
+            self._close_container()
+        else:
+            raise ValueError("unexpected byte in JSON")
+
+    def close(self):
+        """Finish the document (flushes a bare top-level number or literal)."""
+        if self._state == _LITERAL:
+            if self._capture:
+                self.results[self._target] = _literal(self._token)
+            self._end_value()
+        return self.results
@@ -16,9 +16,9 @@ Features
 
 LED Status Codes
 ---------------
-- Very Fast Blink: Ready for update (press bootsel button) first 5 sec after boot
+- Very Fast Blink: Ready for update (press bootsel button) first 5 sec after power-on
 - 0.5s on/off: Waiting to update screen (refresh attempted too early)
-- 1.0s on/off: Normal operation - waiting for next screen update
+- Off: Normal operation - asleep (lightsleep) until the next screen update
 
     Author:        JC
     GitHub:        https://github.com/JohnConnorNPC
@@ -35,36 +35,39 @@ import time
 import rp2
 import network
 import utime
-import urequests
 import machine
 import os
 import gc
+import sys
 
-NEEDS_UPDATE = False
-try:
-    # Project-specific imports
-    from bitmaps import SATORI_BITMAP, LOLLIPOP_BITMAP, SATORI_LOGO
-    from watchdog import Watchdog
-    from scaled_text import ScaledText
-    from epd_2in9_landscape import EPD_2in9_Landscape
-    from ntp_client import NTPClient
-    
-    from display_service import DisplayService
-    import arial10
-    import arial_50
-    import courier20
-    import font10
-    import font6
-    import freesans20
-except ImportError:
-    NEEDS_UPDATE = True
+# Project modules are imported where they are first needed (fonts and bitmaps
+# only when drawing), so a boot reaches the network without loading them all.
+
+_boot_start = time.ticks_ms()
+_boot_mark = _boot_start
+
+def boot_phase(name):
+    """Print how long the boot phase `name` took, and the time since boot started."""
+    global _boot_mark
+    now = time.ticks_ms()
+    print(f"[Boot] {name}: {time.ticks_diff(now, _boot_mark)} ms "
+          f"(total {time.ticks_diff(now, _boot_start)} ms)")
+    _boot_mark = now
 
 # Constants
 EPD_WIDTH = 128
 EPD_HEIGHT = 296
 UPDATE_INTERVAL = 300  # Minimum Screen update interval in seconds (Do not go below manufacturer spec)
+FULL_REFRESH_EVERY = 12  # Partial refreshes between full refreshes (clears ghosting)
+CYCLE_INTERVAL = 3600  # Seconds from the start of one update to the next
+NTP_RESYNC_CYCLES = 24  # Re-sync the clock every this many updates (it keeps running in lightsleep)
+IDLE_FREQ = 64000000  # CPU clock while sleeping between updates
 LAST_UPDATE_FILE = "last_update.txt"
 SETTINGS_FILE = "settings.txt"
+DOWNLOAD_CHUNK = 1024  # Bytes per read when streaming a library to flash
+# Precompiled libraries and the build manifest with every library's size and hash (build_mpy.py)
+MPY_BASE_URL = "https://raw.githubusercontent.com/SatoriNetwork/SatoriScreen/refs/heads/main/dist/"
+UPDATE_INDEX_FILE = "update_index.json"  # Hash of each installed library, compared with the manifest
 
 # Required libraries for GitHub updates
 REQUIRED_LIBRARIES = {
@@ -75,16 +78,37 @@ REQUIRED_LIBRARIES = {
     "font6": "https://raw.githubusercontent.com/waveshareteam/Pico_ePaper_Code/refs/heads/main/pythonNanoGui/gui/fonts/font6.py",
     "freesans20": "https://raw.githubusercontent.com/waveshareteam/Pico_ePaper_Code/refs/heads/main/pythonNanoGui/gui/fonts/freesans20.py",
     "bitmaps": "https://raw.githubusercontent.com/SatoriNetwork/SatoriScreen/refs/heads/main/bitmaps.py",
+    "rle": "https://raw.githubusercontent.com/SatoriNetwork/SatoriScreen/refs/heads/main/rle.py",
     "watchdog": "https://raw.githubusercontent.com/SatoriNetwork/SatoriScreen/refs/heads/main/watchdog.py",
     "scaled_text": "https://raw.githubusercontent.com/SatoriNetwork/SatoriScreen/refs/heads/main/scaled_text.py",
+    "font_writer": "https://raw.githubusercontent.com/SatoriNetwork/SatoriScreen/refs/heads/main/font_writer.py",
     "epd_2in9_landscape": "https://raw.githubusercontent.com/SatoriNetwork/SatoriScreen/refs/heads/main/epd_2in9_landscape.py",
+    "refresh_engine": "https://raw.githubusercontent.com/SatoriNetwork/SatoriScreen/refs/heads/main/refresh_engine.py",
     "ntp_client": "https://raw.githubusercontent.com/SatoriNetwork/SatoriScreen/refs/heads/main/ntp_client.py",
     
+    "http_client": "https://raw.githubusercontent.com/SatoriNetwork/SatoriScreen/refs/heads/main/http_client.py",
+    "json_stream": "https://raw.githubusercontent.com/SatoriNetwork/SatoriScreen/refs/heads/main/json_stream.py",
+    "satori_api": "https://raw.githubusercontent.com/SatoriNetwork/SatoriScreen/refs/heads/main/satori_api.py",
+    "response_cache": "https://raw.githubusercontent.com/SatoriNetwork/SatoriScreen/refs/heads/main/response_cache.py",
+    "address_snapshots": "https://raw.githubusercontent.com/SatoriNetwork/SatoriScreen/refs/heads/main/address_snapshots.py",
+    "price_sources": "https://raw.githubusercontent.com/SatoriNetwork/SatoriScreen/refs/heads/main/price_sources.py",
+    "fleet_record": "https://raw.githubusercontent.com/SatoriNetwork/SatoriScreen/refs/heads/main/fleet_record.py",
+    "pipeline": "https://raw.githubusercontent.com/SatoriNetwork/SatoriScreen/refs/heads/main/pipeline.py",
+    "scheduler": "https://raw.githubusercontent.com/SatoriNetwork/SatoriScreen/refs/heads/main/scheduler.py",
     "display_service": "https://raw.githubusercontent.com/SatoriNetwork/SatoriScreen/refs/heads/main/display_service.py",
     "main": "https://raw.githubusercontent.com/SatoriNetwork/SatoriScreen/refs/heads/main/main.py",
 }
 
+def missing_libraries():
+    """Names of required libraries with no .py or .mpy on flash (checked without importing them)."""
+    files = os.listdir()
+    return [name for name in REQUIRED_LIBRARIES
+            if f"{name}.py" not in files and f"{name}.mpy" not in files]
+
+NEEDS_UPDATE = bool(missing_libraries())
+
 def download_file(url, filename):
+    import urequests
     try:
         print(f"Downloading {filename} from {url}...")
         response = urequests.get(url)
@@ -102,9 +126,13 @@ def download_file(url, filename):
     finally:
         response.close()
 wlan = None
-def connect_wifi(ssid, password, retries=20, delay=1):
+def connect_wifi(ssid, password, retries=20, delay=1, wait=True):
     global wlan
-    """Connect to WiFi network with retry mechanism."""
+    """Connect to WiFi network with retry mechanism.
+
+    With wait=False the association is only started, so it can run while
+    the rest of the boot continues; a later call waits for it to finish.
+    """
     wlan = network.WLAN(network.STA_IF)
     wlan.active(True)
 
@@ -112,7 +140,11 @@ def connect_wifi(ssid, password, retries=20, delay=1):
         print("Already connected to Wi-Fi")
         return True
 
-    wlan.connect(ssid, password)
+    # Don't restart an association a previous wait=False call began
+    if wlan.status() != network.STAT_CONNECTING:
+        wlan.connect(ssid, password)
+    if not wait:
+        return False
     attempt = 0
     
     while not wlan.isconnected() and attempt < retries:
@@ -223,7 +255,6 @@ class Settings:
                 print(f"📅  DATE_FORMAT: {self.DATE_FORMAT}")
                 print(f"📍  ADDRESSES: {self.ADDRESSES}")
                 print("-----------------------------------------")
-                time.sleep(1)
                 
         else:
             print("[Warning] Settings file not found. Please provide the settings:")
@@ -303,47 +334,246 @@ class Settings:
 
 
 class GitHubUpdater:
-    def __init__(self, libraries):
+    def __init__(self, libraries, mpy_base_url=MPY_BASE_URL, index_file=UPDATE_INDEX_FILE):
         self.libraries = libraries
+        self.mpy_base_url = mpy_base_url
+        self.index_file = index_file
+        # lib -> {"file": file installed on flash, "sha256": its hash}
+        self.index = self.load_index()
+        # One buffer reused for every download: the body is copied from the
+        # socket into it and straight out to flash, never held whole in RAM
+        self.arena = bytearray(DOWNLOAD_CHUNK)
+        self.view = memoryview(self.arena)
+
+    def load_index(self):
+        import json
+        try:
+            with open(self.index_file) as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def save_index(self):
+        import json
+        try:
+            temp_filename = self.index_file + ".tmp"
+            with open(temp_filename, "w") as file:
+                json.dump(self.index, file)
+            os.rename(temp_filename, self.index_file)
+        except OSError as e:
+            print(f"Error saving update index: {e}")
+
+    def stream_to_file(self, raw, filename):
+        """
+        Copy a response body from socket `raw` to `filename`, hashing it on the way.
+
+        Returns:
+            tuple: (byte count, SHA-256 hex digest)
+        """
+        import hashlib
+        import binascii
+        digest = hashlib.sha256()
+        total = 0
+        with open(filename, "wb") as f:
+            while True:
+                n = raw.readinto(self.arena)
+                if not n:
+                    break
+                chunk = self.view[:n]
+                digest.update(chunk)
+                f.write(chunk)
+                total += n
+        return total, binascii.hexlify(digest.digest()).decode()
+
+    def download_library(self, lib_name, url, extension=".py", expected=None):
+        """
+        Download `url` to `lib_name` + `extension` through a .tmp file. With
+        `expected` ({"size": ..., "sha256": ...} from the manifest) the file is
+        only renamed into place if it matches.
 
-    def download_library(self, lib_name, url):
+        Returns:
+            str: SHA-256 of the installed file, or None if nothing was installed.
+        """
+        import urequests
+        installed = None
         try:
             print(f"Downloading library '{lib_name}' from {url}...")
             response = urequests.get(url)
 
-            if response.status_code == 200 and response.content:
+            if response.status_code == 200:
+                # Leave response.content alone: reading it would buffer the whole file
                 temp_filename = f"{lib_name}.tmp"
-                with open(temp_filename, "wb") as f:
-                    f.write(response.content)
-                response=None
-                gc.collect()
-                os.rename(temp_filename, f"{lib_name}.py")
-                print(f"Library '{lib_name}' downloaded successfully.")
-                time.sleep(1)
+                size, sha256 = self.stream_to_file(response.raw, temp_filename)
+                if not size:
+                    os.remove(temp_filename)
+                    print(f"Failed to download '{lib_name}'. No content received.")
+                elif expected and (size != expected["size"] or sha256 != expected["sha256"]):
+                    os.remove(temp_filename)
+                    print(f"Rejected '{lib_name}': {size} bytes, sha256 {sha256[:12]}; manifest has "
+                          f"{expected['size']} bytes, sha256 {expected['sha256'][:12]}")
+                else:
+                    os.rename(temp_filename, f"{lib_name}{extension}")
+                    print(f"Library '{lib_name}' downloaded successfully ({size} bytes).")
+                    installed = sha256
+                    time.sleep(1)
             else:
-                print(f"Failed to download '{lib_name}'. HTTP Status Code: {response.status_code} or no content received.")
+                print(f"Failed to download '{lib_name}'. HTTP Status Code: {response.status_code}")
             gc.collect()
         except Exception as e:
             print(f"Error downloading '{lib_name}': {e}")
         finally:
             if 'response' in locals() and response:
                 response.close()
+        return installed
+
+    def fetch_manifest(self):
+        """The build manifest (see build_mpy.py), or None if it cannot be fetched."""
+        import urequests
+        if not self.mpy_base_url:
+            return None
+        response = None
+        try:
+            response = urequests.get(self.mpy_base_url + "manifest.json")
+            if response.status_code != 200:
+                print(f"No build manifest: HTTP {response.status_code}")
+                return None
+            manifest = response.json()
+        except Exception as e:
+            print(f"Error fetching build manifest: {e}")
+            return None
+        finally:
+            if response:
+                response.close()
+        print(f"Build manifest {manifest.get('version')} available")
+        return manifest
+
+    def loads_mpy(self, manifest):
+        """Whether this firmware can load the manifest's .mpy files."""
+        firmware = sys.implementation._mpy & 0xff if hasattr(sys.implementation, "_mpy") else None
+        if manifest.get("mpy") != firmware:
+            print(f"Precompiled build is mpy v{manifest.get('mpy')}, firmware loads v{firmware}: using sources")
+            return False
+        return True
+
+    def file_sha256(self, filename):
+        """SHA-256 hex digest of a file on flash, or None if it cannot be read."""
+        import hashlib
+        import binascii
+        digest = hashlib.sha256()
+        try:
+            with open(filename, "rb") as f:
+                while True:
+                    n = f.readinto(self.arena)
+                    if not n:
+                        break
+                    digest.update(self.view[:n])
+        except OSError:
+            return None
+        return binascii.hexlify(digest.digest()).decode()
+
+    def up_to_date(self, lib, wanted):
+        """
+        Whether the file the index records for `lib` is on flash with the
+        wanted hash. The file itself is hashed, so a corrupted or hand-edited
+        copy is downloaded again even if the index says otherwise.
+        """
+        entry = self.index.get(lib)
+        if wanted is None or entry is None or entry["sha256"] != wanted["sha256"]:
+            return False
+        if entry["file"].endswith(".mpy") and f"{lib}.py" in os.listdir():
+            return False    # the .py would be imported instead
+        return self.file_sha256(entry["file"]) == wanted["sha256"]
+
+    def import_check(self, lib):
+        sys.modules.pop(lib, None)
+        try:
+            __import__(lib)
+            print(f"Library '{lib}' imported successfully after downloading.")
+            return True
+        except Exception as e:  # a bad .mpy raises ValueError, not ImportError
+            print(f"Failed to import '{lib}' even after downloading: {e}")
+            return False
+
+    def remove(self, filename):
+        try:
+            os.remove(filename)
+        except OSError:
+            pass
+
+    def install_compiled(self, lib, compiled):
+        """Install `lib`.mpy; returns its SHA-256, or None with any previous .py left in place."""
+        sha256 = self.download_library(lib, self.mpy_base_url + compiled["file"], ".mpy", compiled)
+        if not sha256:
+            return None
+        # Import prefers name.py over name.mpy, so the source is moved aside for the check
+        try:
+            os.rename(f"{lib}.py", f"{lib}.bak")
+        except OSError:
+            pass
+        if self.import_check(lib):
+            self.remove(f"{lib}.bak")
+            return sha256
+        self.remove(f"{lib}.mpy")
+        try:
+            os.rename(f"{lib}.bak", f"{lib}.py")
+        except OSError:
+            pass
+        return None
 
-    def check_and_download_libraries(self):
-        for lib, url in self.libraries.items():
-            if NEEDS_UPDATE:
-             try:
-                if os.stat(f"{lib}.py"):
+    def check_and_download_libraries(self, force=False):
+        """
+        Download the libraries that changed since the last update. With a build
+        manifest, a library is skipped when its current hash is already
+        installed, and every download is checked against the manifest;
+        without one, or with force=True, everything is downloaded.
+        """
+        manifest = self.fetch_manifest()
+        entries = manifest.get("files", {}) if manifest else {}
+        compiled_ok = manifest is not None and self.loads_mpy(manifest)
+        missing = missing_libraries()
+        gc.collect()
+        unchanged = 0
+        try:
+            for lib, url in self.libraries.items():
+                entry = entries.get(lib, {})
+                compiled = entry if compiled_ok and "file" in entry else None
+                source = entry.get("source")
+                if lib not in missing and not force and (NEEDS_UPDATE or self.up_to_date(lib, compiled or source)):
+                    unchanged += 1
                     continue
-             except:
-                 print(f"{lib}.py does not exist ")
-            print(f"Library '{lib}' Downloading...")
-            self.download_library(lib, url)
-            try:
-                __import__(lib)
-                print(f"Library '{lib}' imported successfully after downloading.")
-            except ImportError:
-                print(f"Failed to import '{lib}' even after downloading.")
+                print(f"Library '{lib}' Downloading...")
+                if compiled:
+                    sha256 = self.install_compiled(lib, compiled)
+                    if sha256:
+                        self.index[lib] = {"file": f"{lib}.mpy", "sha256": sha256}
+                        continue
+                    print(f"Falling back to the source of '{lib}'")
+                sha256 = self.download_library(lib, url, ".py", source)
+                if sha256:
+                    self.index[lib] = {"file": f"{lib}.py", "sha256": sha256}
+                    self.import_check(lib)
+        finally:
+            self.save_index()
+        print(f"{unchanged} of {len(self.libraries)} libraries unchanged")
+
+_display = None
+
+def make_display():
+    """One long-lived panel driver, framebuffer and refresh engine, created on first use."""
+    global _display
+    if _display:
+        return _display
+    from epd_2in9_landscape import EPD_2in9_Landscape
+    from scaled_text import ScaledText
+    from refresh_engine import RefreshEngine
+    epd = EPD_2in9_Landscape()
+    text_handler = ScaledText(epd, EPD_WIDTH)
+    text_handler.warm_cache()
+    # Panel RAM only survives if the panel stayed powered (not a power-on reset)
+    refresher = RefreshEngine(len(epd.buffer), FULL_REFRESH_EVERY,
+                              ram_retained=machine.reset_cause() != machine.PWRON_RESET)
+    _display = (epd, text_handler, refresher)
+    return _display
 
 def save_last_update_time():
     try:
@@ -393,109 +623,195 @@ if __name__ == "__main__":
         
         # Initialize LED control
         led = LEDControl()
-        
-        # Check for update mode
-        led_on = True
-        start_time = time.time()
-        print("Checking for bootsel button press - Update mode")
-        
-        while time.time() - start_time < 5:
-            led.turn_on() if led_on else led.turn_off()
-            led_on = not led_on
-            
-            if rp2.bootsel_button() or NEEDS_UPDATE:
-                if NEEDS_UPDATE:
-                    if not connect_wifi(WIFI_SSID, WIFI_PASSWORD):
-                        raise Exception("WiFi connection failed")
-                print("Update mode activated")
-                
-                updater = GitHubUpdater(REQUIRED_LIBRARIES)
-                updater.check_and_download_libraries()
-                print("Update complete, rebooting...")
-                led.turn_on()
-                time.sleep(10)
-                machine.reset()
-            
-            time.sleep(0.05)
-        
+        boot_phase("settings")
+
+        # Start associating now; it completes while the rest of the boot runs
+        connect_wifi(WIFI_SSID, WIFI_PASSWORD, wait=False)
+
+        def update_mode(force=False):
+            if not connect_wifi(WIFI_SSID, WIFI_PASSWORD):
+                raise Exception("WiFi connection failed")
+            print("Update mode activated")
+
+            updater = GitHubUpdater(REQUIRED_LIBRARIES)
+            updater.check_and_download_libraries(force)
+            print("Update complete, rebooting...")
+            led.turn_on()
+            time.sleep(10)
+            machine.reset()
+
+        if NEEDS_UPDATE:
+            print(f"Missing libraries: {missing_libraries()}")
+            update_mode()
+
+        # Check for update mode. Only a power-on opens the window: watchdog and
+        # soft resets (crashes, our own machine.reset()) skip straight on.
+        if machine.reset_cause() == machine.PWRON_RESET:
+            led_on = True
+            start_time = time.time()
+            print("Checking for bootsel button press - Update mode")
+
+            while time.time() - start_time < 5:
+                led.turn_on() if led_on else led.turn_off()
+                led_on = not led_on
+
+                if rp2.bootsel_button():
+                    update_mode()
+
+                time.sleep(0.05)
+            boot_phase("update window")
+
+        try:
+            # Everything core 0 needs, loaded before core 1 starts importing the display stack
+            from watchdog import Watchdog
+            from pipeline import DisplayPipeline
+            from scheduler import Scheduler
+            from ntp_client import NTPClient
+            from display_service import DisplayService
+        except Exception as e:
+            # A library is on flash but broken (ImportError, a truncated .py's
+            # SyntaxError, a bad .mpy's ValueError): fetch them all again
+            print(f"Import failed: {e}")
+            update_mode(force=True)
+        boot_phase("imports")
+
+        display_service = DisplayService(EPD_WIDTH, EPD_HEIGHT)
+
+        pipeline = None
+
         # Connect to WiFi for normal operation
         if not connect_wifi(WIFI_SSID, WIFI_PASSWORD):
             raise Exception("WiFi connection failed")
         print("WiFi Connected")
+        boot_phase("wifi")
         
         # Initialize components
         watchdog = Watchdog()
-        
-        display_service = DisplayService(EPD_WIDTH, EPD_HEIGHT)
         watchdog.feed()
         
         # Set system time
         ntp_client = NTPClient(timezone_gmt_offset=GMT_OFFSET)
         ntp_client.set_time()
+        boot_phase("ntp")
+        
+        watchdog.feed()
+        if display_service.thin_client:
+            epd, text_handler, refresher = make_display()
+            boot_phase("display")
+        watchdog.feed()
         
         led.turn_off()
         led_on = True
 
-        while True:
+        # Respect the minimum interval since the last update (e.g. after a crash reboot)
+        while not can_update_screen():
             watchdog.feed()
-            
-            if can_update_screen():
-                # Fetch all data using the display service
-                
-                balance_data = display_service.fetch_all_address_info(ADDRESSES, watchdog)
-                
-                gc.collect()
-                neurons_data = display_service.fetch_neurons_data(watchdog)
-                
-                gc.collect()
-                satori_price = display_service.get_satori_price(watchdog)
-                
-                gc.collect()
-                
-                
-                
-                # Initialize display
-                watchdog.feed()
-                epd = EPD_2in9_Landscape()
-                text_handler = ScaledText(epd, EPD_WIDTH)
-                    
-                gc.collect()
-                    
-                # Update display using the display service
-                display_service.update_display(epd, text_handler, balance_data, neurons_data, satori_price, watchdog, None)
-                   
-                watchdog.feed()
-                epd.display(epd.buffer)
-                epd.sleep()
-                watchdog.feed()
-                    
-                # Save update time
-                save_last_update_time()
-                SECONDS_IN_HOUR = 3600
-                counter = 0
+            time.sleep(0.5)
+            led.turn_on() if led_on else led.turn_off()
+            led_on = not led_on
+        led.turn_off()
 
-                # Blink LED to indicate successful update
-                
-                #Low power mode.  19 MA vs ~150 ma while active
+        # Core 1 brings up the panel and draws the static layout while this core
+        # does the fetches. Started only now: the wait above can outlast core 1's
+        # CORE1_WAIT_S. Thin clients stream the frame from the network instead,
+        # so they keep the panel on this core.
+        if not display_service.thin_client:
+            pipeline = DisplayPipeline(make_display, display_service)
+            pipeline.start()
+
+        cycle = 0
+
+        def power_down():
+            """Radio off and panel asleep, whether or not the update succeeded."""
+            #Low power mode.  19 MA vs ~150 ma while active
+            try:
                 wlan.active(False)
                 wlan.disconnect()
                 wlan.deinit()
-                machine.freq(64000000)
-                while True:
-                    time.sleep(1)
-                    counter += 1
-                    led.turn_on() if led_on else led.turn_off()
-                    led_on = not led_on
+            except Exception as e:
+                print(f"Error turning WiFi off: {e}")
+            watchdog.feed()
+            if pipeline is None and _display:
+                try:
+                    _display[0].sleep()  # waits for BUSY before entering deep sleep
+                except Exception as e:
+                    print(f"Error putting the panel to sleep: {e}")
+            watchdog.feed()
+            gc.collect()
+
+        def update():
+            global pipeline, epd, text_handler, refresher, cycle
+            try:
+                if cycle:
+                    # Woken from lightsleep: state is still live, only WiFi and core 1 restart
+                    if pipeline is not None and pipeline.running:
+                        pipeline.abort(watchdog)  # left over from a failed cycle
+                    if not display_service.thin_client:
+                        pipeline = DisplayPipeline(make_display, display_service)
+                        pipeline.start()
+                    if not connect_wifi(WIFI_SSID, WIFI_PASSWORD):
+                        raise Exception("WiFi connection failed")
                     watchdog.feed()
-                    if counter >= SECONDS_IN_HOUR:
-                        machine.reset()
-                        
-            
-            # Wait before next check
-            time.sleep(0.5)
-            led.turn_on() if led_on else led.turn_off()
-            led_on = not led_on            
-            
+                    if cycle % NTP_RESYNC_CYCLES == 0:
+                        ntp_client.set_time()
+                else:
+                    boot_phase("ready for first request")
+                cycle += 1
+
+                # Thin client: the aggregator renders the frame, streamed straight to the panel
+                shown = False
+                if pipeline is None and display_service.thin_client:
+                    shown = display_service.show_remote_frame(epd, ADDRESSES, watchdog)
+                    # Panel RAM (even a half-streamed frame) no longer matches the
+                    # saved frame, so the next local render must be a full refresh
+                    refresher.invalidate()
+                if not shown:
+                    # Fetch all data using the display service
+                    balance_data, neurons_data, satori_price = display_service.fetch_all(ADDRESSES, watchdog)
+
+                    gc.collect()
+                    watchdog.feed()
+
+                    if pipeline:
+                        # Core 1 draws the values over its static frame and starts the refresh
+                        pipeline.submit(balance_data, neurons_data, satori_price)
+                        epd, text_handler, refresher = pipeline.finish(watchdog)
+                        pipeline = None
+                    else:
+                        # Bring the panel up only as far as its state requires
+                        epd.wake()
+
+                        gc.collect()
+
+                        # Update display using the display service
+                        display_service.update_display(epd, text_handler, balance_data, neurons_data, satori_price, watchdog, None)
+
+                        watchdog.feed()
+                        refresher.show(epd, wait=False)
+
+                # Save update time and drop WiFi while the panel refreshes
+                save_last_update_time()
+            except Exception:
+                if pipeline:
+                    # Free core 1 (and the panel) so the next cycle can start a new pipeline;
+                    # if it will not stop, the panel stays with it and the error stands
+                    try:
+                        pipeline.abort(watchdog)
+                        pipeline = None
+                    except RuntimeError as e:
+                        print(f"Error stopping display core: {e}")
+                raise
+            finally:
+                power_down()
+
+        # Sleep between updates instead of rebooting: lightsleep in chunks the
+        # watchdog survives, at a reduced clock for the brief wakes
+        active_freq = machine.freq()
+        scheduler = Scheduler(CYCLE_INTERVAL, watchdog)
+        scheduler.run(update,
+                      before_sleep=lambda: machine.freq(IDLE_FREQ),
+                      after_wake=lambda: machine.freq(active_freq))
+
     except Exception as e:
         print(f"Runtime error: {e}")
         machine.reset()
@@ -0,0 +1,169 @@
+# pipeline.py
+#
+# Runs the display side of an update on the RP2040's second core. Core 1
+# creates and owns the EPD, wakes the panel and draws the static layout
+# while core 0 is busy with WiFi, NTP and the HTTP fetches; core 0 then
+# posts the fetched values and core 1 draws them and starts the refresh.
+# A cycle then takes about max(network, display) instead of their sum.
+# Works with CPython threads too, for testing with an injected display.
+
+import _thread
+import time
+
+CORE1_STACK = 8 * 1024   # rendering nests a few calls deep; the default is smaller
+POLL_S = 0.005
+CORE1_WAIT_S = 300       # core 1 gives up on the data if core 0 never posts it or an abort
+
+
+class Aborted(RuntimeError):
+    pass
+
+
+class Mailbox:
+    """Named slots handed between the cores, guarded by one lock."""
+
+    def __init__(self):
+        self._lock = _thread.allocate_lock()
+        self._slots = {}
+
+    def put(self, name, value):
+        with self._lock:
+            self._slots[name] = value
+
+    def take(self, name):
+        """Remove and return (True, value), or (False, None) if the slot is empty."""
+        with self._lock:
+            if name in self._slots:
+                return True, self._slots.pop(name)
+            return False, None
+
+    def wait(self, name, timeout_s=None, watchdog=None, cancel=None):
+        """
+        Block until `name` is posted and return its value. MicroPython's
+        _thread has no condition variables, so this polls the slot.
+
+        Raises:
+            Aborted: If the `cancel` slot is posted first.
+            RuntimeError: If nothing arrives within timeout_s seconds.
+        """
+        start = time.time()
+        while True:
+            found, value = self.take(name)
+            if found:
+                return value
+            if cancel is not None and self.take(cancel)[0]:
+                raise Aborted(f"'{name}' cancelled")
+            if watchdog:
+                watchdog.feed()
+            if timeout_s is not None and time.time() - start > timeout_s:
+                raise RuntimeError(f"timed out waiting for '{name}'")
+            time.sleep(POLL_S)
+
+
+class _NoWatchdog:
+    # Core 0 feeds the real watchdog while it waits for core 1
+    def feed(self):
+        pass
+
+
+class DisplayPipeline:
+    """
+    Usage (core 0):
+        pipeline = DisplayPipeline(make_display, display_service)
+        pipeline.start()                     # core 1 starts drawing
+        ...connect WiFi, fetch data...
+        pipeline.submit(balance_data, neurons_data, satori_price)
+        epd, text_handler, refresher = pipeline.finish(watchdog)
+
+    If core 0 fails before submit(), it calls pipeline.abort(watchdog): core 1
+    stops waiting and exits, so the next cycle can start a new pipeline.
+
+    make_display() is called on core 1 and must return
+    (epd, text_handler, refresher); the EPD stays on core 1 until finish()
+    hands it back, so core 0 must not touch the panel in between.
+    """
+
+    def __init__(self, make_display, display_service):
+        self.make_display = make_display
+        self.display_service = display_service
+        self.mailbox = Mailbox()
+        self.started = False
+        self.running = False
+
+    def start(self):
+        try:
+            _thread.stack_size(CORE1_STACK)
+        except (AttributeError, ValueError):
+            pass    # CPython rejects stacks under 32 KiB; its default is ample
+        self.running = True
+        try:
+            _thread.start_new_thread(self._core1, ())
+        except Exception:
+            self.running = False    # e.g. core 1 still busy with an earlier pipeline
+            raise
+        self.started = True
+
+    def _core1(self):
+        mailbox = self.mailbox
+        service = self.display_service
+        try:
+            display = self.make_display()
+            epd, text_handler, refresher = display
+            epd.wake()
+            service.draw_static(epd, text_handler)
+            mailbox.put("static", True)
+
+            balance_data, neurons_data, satori_price = mailbox.wait("data", CORE1_WAIT_S, cancel="abort")
+            service.draw_dynamic(epd, text_handler, balance_data, neurons_data, satori_price, _NoWatchdog())
+            mode = refresher.show(epd, wait=False)
+            print(f"Core 1: {mode} refresh started")
+            mailbox.put("done", display)
+        except Aborted:
+            print("Core 1: aborted")
+        except Exception as e:
+            mailbox.put("error", e)
+        finally:
+            self.running = False
+
+    def submit(self, balance_data, neurons_data, satori_price):
+        """Hand the fetched values to core 1."""
+        self.mailbox.put("data", (balance_data, neurons_data, satori_price))
+
+    def finish(self, watchdog, timeout_s=60):
+        """
+        Wait for core 1 to start the refresh, feeding `watchdog`.
+
+        Returns:
+            tuple: (epd, text_handler, refresher), now owned by the caller.
+
+        Raises:
+            RuntimeError: If core 1 failed or did not finish within timeout_s.
+        """
+        start = time.time()
+        while True:
+            found, error = self.mailbox.take("error")
+            if found:
+                raise RuntimeError(f"display core failed: {error}")
+            found, display = self.mailbox.take("done")
+            if found:
+                return display
+            watchdog.feed()
+            if time.time() - start > timeout_s:
+                raise RuntimeError("display core did not finish")
+            time.sleep(POLL_S)
+
+    def abort(self, watchdog, timeout_s=30):
+        """
+        Stop core 1 before submit() (e.g. the fetch failed) and wait for it to
+        exit, feeding `watchdog`. The panel is then free for core 0.
+
+        Raises:
+            RuntimeError: If core 1 is still running after timeout_s.
+        """
+        self.mailbox.put("abort", True)
+        start = time.time()
+        while self.running:
+            watchdog.feed()
+            if time.time() - start > timeout_s:
+                raise RuntimeError("display core did not stop")
+            time.sleep(POLL_S)
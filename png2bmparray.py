@@ -1,69 +1,187 @@
 import argparse
+import hashlib
+import json
+import os
+import re
 from PIL import Image
 import numpy as np
 
-def png_to_bitmap_array(image_path, width=None, height=None, invert=False):
+import rle
+
+BITMAPS_HEADER = '''"""
+bitmaps.py: A library of pre-defined bitmaps for use in MicroPython projects.
+
+Generated by png2bmparray.py --batch; edit the source PNGs, not this file.
+
+Each bitmap is a bytes literal packed as {packing} ({packing_doc}), so it is a
+single constant that can stay in flash when frozen instead of a list of
+int objects on the heap. <NAME>_WIDTH / <NAME>_HEIGHT give its size{rle_doc}.
+
+Usage:
+    Import this module in your MicroPython project:
+        from bitmaps import {names}
+"""
+
+PACKING = "{packing}"
+RLE = {rle}
+'''
+
+PACKING_DOCS = {
+    "hlsb": "MSB-first rows, framebuf.MONO_HLSB",
+    "vlsb": "LSB-top 8-pixel columns, framebuf.MONO_VLSB",
+}
+
+def pack_pixels(pixels, packing="hlsb"):
     """
-    Convert a PNG image to a bitmap array format using its original dimensions by default.
+    Pack a 2D array of 0/1 pixels into bytes with np.packbits.
     
     Args:
-        image_path (str): Path to the PNG image
-        width (int): Desired width in pixels (default None, uses image's width)
-        height (int): Desired height in pixels (default None, uses image's height)
-        invert (bool): Whether to invert pixel colors (default False)
+        pixels (ndarray): height x width array of 0/1 values
+        packing (str): "hlsb" (rows, MSB = leftmost pixel) or "vlsb"
+            (8-pixel vertical bytes, LSB = top pixel, as the EPD framebuffer)
     
     Returns:
-        list: Bitmap array where each element represents a byte (8 bits)
+        bytes: Packed bitmap
     """
-    # Open image and get original size
+    if packing == "hlsb":
+        return np.packbits(pixels, axis=1).tobytes()
+    if packing == "vlsb":
+        height, width = pixels.shape
+        padded = np.zeros(((height + 7) // 8 * 8, width), dtype=np.uint8)
+        padded[:height] = pixels
+        pages = padded.reshape(-1, 8, width)
+        return np.packbits(pages, axis=1, bitorder="little").tobytes()
+    raise ValueError(f"Unknown packing '{packing}'")
+
+def load_pixels(image_path, width=None, height=None, invert=False):
+    """Open an image, resize it if asked, and threshold it to a 0/1 array."""
     img = Image.open(image_path)
     img = img.convert('L')  # Convert to grayscale
     
-    # Use original image dimensions if width and height are not provided
     original_width, original_height = img.size
     width = width or original_width
     height = height or original_height
-
-    # Resize only if dimensions are explicitly specified
     if (width, height) != img.size:
         img = img.resize((width, height), Image.Resampling.LANCZOS)
     
-    # Convert to numpy array and threshold
     pixels = (np.array(img) < 128).astype(np.uint8)  # Threshold at 128
-    
     if invert:
         pixels = 1 - pixels  # Invert the binary pixel values
+    return pixels
+
+def png_to_bitmap_array(image_path, width=None, height=None, invert=False):
+    """
+    Convert a PNG image to a bitmap array format using its original dimensions by default.
     
-    # Initialize bitmap array
-    bytes_per_row = (width + 7) // 8
-    bitmap = []
+    Args:
+        image_path (str): Path to the PNG image
+        width (int): Desired width in pixels (default None, uses image's width)
+        height (int): Desired height in pixels (default None, uses image's height)
+        invert (bool): Whether to invert pixel colors (default False)
     
-    # Convert pixels to bitmap array
-    for y in range(height):
-        for byte_index in range(bytes_per_row):
-            byte = 0
-            for bit in range(8):
-                x = byte_index * 8 + bit
-                if x < width:
-                    byte |= pixels[y, x] << (7 - bit)
-            bitmap.append(byte)
+    Returns:
+        list: Bitmap array where each element represents a byte (8 bits)
+    """
+    pixels = load_pixels(image_path, width, height, invert)
+    height, width = pixels.shape
+    return list(pack_pixels(pixels)), width, height  # Return dimensions for verification
+
+def bitmap_name(filename):
+    """satori-logo.png -> SATORI_LOGO"""
+    stem = os.path.splitext(os.path.basename(filename))[0]
+    name = re.sub(r"[^0-9A-Za-z]+", "_", stem).strip("_").upper()
+    return "_" + name if name[:1].isdigit() else name
+
+def format_bytes_literal(name, data, bytes_per_row, comment=""):
+    lines = [f"{name} = ({comment}"]
+    for i in range(0, len(data), bytes_per_row):
+        row_str = "".join(f"\\x{byte:02x}" for byte in data[i:i + bytes_per_row])
+        lines.append(f'    b"{row_str}"  # Row {i // bytes_per_row + 1}')
+    lines.append(")")
+    return "\n".join(lines)
+
+def convert_directory(directory, output, packing="hlsb", invert=False, compress=False, cache_file=None):
+    """
+    Convert every PNG in `directory` and write a complete bitmaps module.
+    
+    Images whose content hash (and conversion options) match the cache are
+    not decoded again; their packed data is reused from the cache.
     
-    return bitmap, width, height  # Return dimensions for verification
+    Returns:
+        tuple: (number converted, number reused from cache)
+    """
+    cache = {}
+    if cache_file and os.path.exists(cache_file):
+        with open(cache_file) as f:
+            cache = json.load(f)
+
+    options = f"{packing}:{int(invert)}"
+    entries = []
+    converted = reused = 0
+    for filename in sorted(os.listdir(directory)):
+        if not filename.lower().endswith(".png"):
+            continue
+        path = os.path.join(directory, filename)
+        with open(path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        key = f"{digest}:{options}"
+        entry = cache.get(filename)
+        if entry is None or entry["key"] != key:
+            pixels = load_pixels(path, invert=invert)
+            height, width = pixels.shape
+            entry = {"key": key, "width": width, "height": height,
+                     "data": pack_pixels(pixels, packing).hex()}
+            cache[filename] = entry
+            converted += 1
+        else:
+            reused += 1
+        entries.append((bitmap_name(filename), entry))
 
-def print_bitmap_as_code(bitmap, bytes_per_row=4):
+    # Drop images that no longer exist
+    for filename in list(cache):
+        if not os.path.exists(os.path.join(directory, filename)):
+            del cache[filename]
+
+    names = ", ".join(name for name, _ in entries)
+    parts = [BITMAPS_HEADER.format(
+        packing=packing,
+        packing_doc=PACKING_DOCS[packing],
+        rle_doc="; the data is RLE-compressed (RLE = True), decoded by ScaledText with rle.py" if compress else "",
+        rle=bool(compress),
+        names=names,
+    )]
+    for name, entry in entries:
+        width, height = entry["width"], entry["height"]
+        data = bytes.fromhex(entry["data"])
+        row = (width + 7) // 8 if packing == "hlsb" else width
+        if compress:
+            data = rle.encode(data)
+            row = 16
+        parts.append(format_bytes_literal(name, data, row, f"  # {width} x {height}"))
+        parts.append(f"{name}_WIDTH = {width}\n{name}_HEIGHT = {height}\n")
+
+    with open(output, "w", newline="\r\n") as f:
+        f.write("\n".join(parts))
+    if cache_file:
+        with open(cache_file, "w") as f:
+            json.dump(cache, f, indent=1, sort_keys=True)
+    return converted, reused
+
+def print_bitmap_as_code(bitmap, bytes_per_row=4, name="BITMAP", compress=False):
     """
-    Print bitmap as Python code with binary literals.
+    Print bitmap as Python code with a bytes literal (the bitmaps.py format).
     
     Args:
         bitmap (list): List of bytes representing the bitmap
         bytes_per_row (int): Number of bytes per row in the output
+        name (str): Variable name to emit
+        compress (bool): RLE-compress the data (decode on the device with rle.py)
     """
-    print("BITMAP = [")
-    for i in range(0, len(bitmap), bytes_per_row):
-        row_bytes = bitmap[i:i + bytes_per_row]
-        row_str = ", ".join(f"0b{byte:08b}" for byte in row_bytes)
-        print(f"    {row_str},  # Row {i // bytes_per_row + 1}")
-    print("]")
+    if compress:
+        bitmap = rle.encode(bytes(bitmap))
+        name += "_RLE"
+        bytes_per_row = 16
+    print(format_bytes_literal(name, bitmap, bytes_per_row))
 
 def visualize_bitmap(bitmap, width):
     """
@@ -84,12 +202,25 @@ def visualize_bitmap(bitmap, width):
 if __name__ == "__main__":
     # Parse command-line arguments
     parser = argparse.ArgumentParser(description="Convert PNG image to a bitmap array.")
-    parser.add_argument("image_path", type=str, help="Path to the PNG image.")
+    parser.add_argument("image_path", type=str, nargs="?", help="Path to the PNG image.")
+    parser.add_argument("--batch", metavar="DIR", help="Convert every PNG in DIR and write a bitmaps module.")
+    parser.add_argument("--output", default="bitmaps.py", help="Module written in batch mode (default bitmaps.py).")
+    parser.add_argument("--packing", choices=("hlsb", "vlsb"), default="hlsb", help="Bit packing for batch mode.")
+    parser.add_argument("--cache", default=".bitmaps_cache.json", help="Content-hash cache for batch mode ('' to disable).")
     parser.add_argument("--width", type=int, default=None, help="Optional width to resize the image.")
     parser.add_argument("--height", type=int, default=None, help="Optional height to resize the image.")
     parser.add_argument("--invert", action="store_true", help="Invert pixel colors.")
+    parser.add_argument("--rle", action="store_true", help="Emit RLE-compressed bytes (see rle.py).")
     args = parser.parse_args()
 
+    if args.batch:
+        converted, reused = convert_directory(args.batch, args.output, args.packing,
+                                              args.invert, args.rle, args.cache or None)
+        print(f"Wrote {args.output}: {converted} converted, {reused} unchanged")
+        raise SystemExit(0)
+    if not args.image_path:
+        parser.error("image_path is required unless --batch is given")
+
     # Process image and generate bitmap
     bitmap, width, height = png_to_bitmap_array(args.image_path, args.width, args.height, args.invert)
     
@@ -97,7 +228,7 @@ if __name__ == "__main__":
     print(f"Image dimensions: {width}x{height}\n")
     
     print("Bitmap as Python code:")
-    print_bitmap_as_code(bitmap)
+    print_bitmap_as_code(bitmap, bytes_per_row=(width + 7) // 8, compress=args.rle)
     
     print("\nBitmap visualization:")
     visualize_bitmap(bitmap, width)
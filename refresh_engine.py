@@ -0,0 +1,140 @@
+# refresh_engine.py
+
+import os
+
+LAST_FRAME_FILE = "last_frame.bin"
+
+
+class RefreshEngine:
+    """
+    Decides between a full and a partial ePaper refresh.
+
+    The last frame actually shown is kept in RAM and on flash so it survives
+    machine.reset(). Each new frame is diffed against it; only the changed
+    byte-aligned windows are written to the panel and refreshed with the
+    partial waveform. Every `full_every` partials a full refresh is forced to
+    clear ghosting.
+
+    File layout: one byte partial counter followed by the raw framebuffer.
+    """
+
+    def __init__(self, frame_size, full_every=10, ram_retained=True, filename=LAST_FRAME_FILE):
+        """
+        Args:
+            frame_size (int): Size of the framebuffer in bytes.
+            full_every (int): Number of partial refreshes between full refreshes.
+            ram_retained (bool): False if the panel lost power since the last frame
+                was shown (e.g. power-on reset); its RAM is then unknown and the
+                first refresh is a full one.
+            filename (str): Where the last shown frame is persisted.
+        """
+        self.full_every = full_every
+        self.filename = filename
+        self.last = bytearray(frame_size)
+        self.partials = 0
+        self.valid = ram_retained and self._load()
+
+    def _load(self):
+        try:
+            if os.stat(self.filename)[6] != len(self.last) + 1:
+                return False
+            with open(self.filename, "rb") as file:
+                header = file.read(1)
+                file.readinto(self.last)
+            self.partials = header[0]
+            return True
+        except OSError:
+            return False
+
+    def _save(self):
+        try:
+            temp_filename = self.filename + ".tmp"
+            with open(temp_filename, "wb") as file:
+                file.write(bytes([min(self.partials, 255)]))
+                file.write(self.last)
+            os.rename(temp_filename, self.filename)
+        except OSError as e:
+            print(f"Error saving last frame: {e}")
+
+    def invalidate(self):
+        """Forget the last frame, e.g. after the panel RAM was written some other way."""
+        self.valid = False
+        try:
+            os.remove(self.filename)
+        except OSError:
+            pass
+
+    def dirty_windows(self, image, bands, row):
+        """
+        Return the changed windows as (band_start, band_end, col_start, col_end).
+
+        A band is one 8-pixel row of the MONO_VLSB buffer. Consecutive dirty
+        bands are merged into one window spanning their combined columns.
+        """
+        last = self.last
+        windows = []
+        current = None
+        for j in range(bands):
+            start = j * row
+            end = start + row
+            if image[start:end] == last[start:end]:
+                current = None
+                continue
+            first = start
+            while image[first] == last[first]:
+                first += 1
+            final = end - 1
+            while image[final] == last[final]:
+                final -= 1
+            first -= start
+            final -= start
+            if current is None:
+                current = [j, j, first, final]
+                windows.append(current)
+            else:
+                current[1] = j
+                current[2] = min(current[2], first)
+                current[3] = max(current[3], final)
+        return windows
+
+    def show(self, epd, image=None, wait=True):
+        """
+        Push `image` (default: epd.buffer) to the panel using the cheapest
+        refresh that keeps it clean.
+
+        With wait=False a full refresh is left running so the caller can do
+        other work; partial refreshes are short and always waited for, since
+        the panel RAM is touched again afterwards.
+
+        Returns:
+            str: "full", "partial" or "unchanged".
+        """
+        if image is None:
+            image = epd.buffer
+
+        if not self.valid or self.partials >= self.full_every:
+            epd.wake()
+            epd.SetFullWindow()
+            epd.display_Base(image, wait)
+            self.partials = 0
+            mode = "full"
+        else:
+            windows = self.dirty_windows(image, epd.width // 8, epd.height)
+            if not windows:
+                print("Frame unchanged, skipping refresh")
+                return "unchanged"
+            epd.begin_partial()
+            for band_start, band_end, col_start, col_end in windows:
+                epd.write_window(0x24, image, band_start, band_end, col_start, col_end)
+            epd.TurnOnDisplay_Partial()
+            # Bring the "previous image" RAM in line so the next diff starts clean
+            for band_start, band_end, col_start, col_end in windows:
+                epd.write_window(0x26, image, band_start, band_end, col_start, col_end)
+            self.partials += 1
+            mode = "partial"
+            print(f"Partial refresh of {len(windows)} window(s), {self.partials}/{self.full_every}")
+
+        self.last[:] = image
+        self.valid = True
+        self._save()
+        return mode
@@ -0,0 +1,75 @@
+# response_cache.py
+#
+# Flash-backed cache of decoded API values. Slow-moving endpoints are served
+# from it until their TTL runs out, then revalidated with If-None-Match, and
+# any endpoint can fall back to its last good value when a fetch fails.
+
+import os
+import time
+try:
+    import ujson as json
+except ImportError:
+    import json
+
+CACHE_FILE = "response_cache.json"
+
+
+class ResponseCache:
+    """
+    Key -> {"t": time stored, "etag": ETag or None, "v": value} on flash.
+
+    Values must be JSON-serialisable (tuples come back as lists). Changes
+    are kept in RAM until save(), so a cycle costs at most one flash write.
+    """
+
+    def __init__(self, filename=CACHE_FILE):
+        self.filename = filename
+        self.entries = {}
+        self.dirty = False
+        try:
+            with open(filename) as file:
+                self.entries = json.load(file)
+        except (OSError, ValueError):
+            pass
+
+    def fresh(self, key, ttl):
+        """Return the cached value if it was stored less than `ttl` seconds ago, else None."""
+        entry = self.entries.get(key)
+        if entry is None or ttl <= 0:
+            return None
+        age = time.time() - entry["t"]
+        if 0 <= age < ttl:
+            return entry["v"]
+        return None
+
+    def stale(self, key):
+        """Return the last stored value for `key` regardless of age, or None."""
+        entry = self.entries.get(key)
+        return entry["v"] if entry else None
+
+    def etag(self, key):
+        entry = self.entries.get(key)
+        return entry.get("etag") if entry else None
+
+    def store(self, key, value, etag=None):
+        self.entries[key] = {"t": time.time(), "etag": etag, "v": value}
+        self.dirty = True
+
+    def touch(self, key):
+        """Mark `key` as fresh again (the server answered 304 Not Modified)."""
+        entry = self.entries.get(key)
+        if entry:
+            entry["t"] = time.time()
+            self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        try:
+            temp_filename = self.filename + ".tmp"
+            with open(temp_filename, "w") as file:
+                json.dump(self.entries, file)
+            os.rename(temp_filename, self.filename)
+            self.dirty = False
+        except OSError as e:
+            print(f"Error saving response cache: {e}")
@@ -0,0 +1,95 @@
+# rle.py
+#
+# PackBits-style run-length coding for bitmap data.
+#
+# A header byte n < 0x80 is followed by n + 1 literal bytes; a header byte
+# n >= 0x80 is followed by one byte that repeats n - 0x7E times (2..129).
+
+def encode(data):
+    """Compress `data` (bytes-like); used host-side by png2bmparray.py."""
+    out = bytearray()
+    i = 0
+    n = len(data)
+    while i < n:
+        run = 1
+        while i + run < n and run < 129 and data[i + run] == data[i]:
+            run += 1
+        if run > 1:
+            out.append(run + 0x7E)
+            out.append(data[i])
+            i += run
+            continue
+        start = i
+        while i < n and i - start < 128 and (i + 1 >= n or data[i + 1] != data[i]):
+            i += 1
+        if i == start:
+            i += 1
+        out.append(i - start - 1)
+        out.extend(data[start:i])
+    return bytes(out)
+
+
+def decoded_size(src):
+    """Size of the decoded data, without decoding it."""
+    size = 0
+    i = 0
+    n = len(src)
+    while i < n:
+        header = src[i]
+        if header < 0x80:
+            size += header + 1
+            i += header + 2
+        else:
+            size += header - 0x7E
+            i += 2
+    return size
+
+
+def decode_into(src, dst):
+    """Decode all of `src` into the preallocated buffer `dst`; returns the length."""
+    return RLEReader(src).readinto(dst)
+
+
+class RLEReader:
+    """
+    Stream decoder with a readinto() interface, so compressed data can be
+    decoded chunk by chunk into a small reusable buffer.
+    """
+
+    def __init__(self, src):
+        self.src = memoryview(src)
+        self.pos = 0
+        self.literal = 0    # literal bytes still to copy
+        self.repeat = 0     # repeats of self.value still to emit
+        self.value = 0
+
+    def readinto(self, buf):
+        src = self.src
+        n = len(buf)
+        out = 0
+        while out < n:
+            if self.literal:
+                count = min(self.literal, n - out)
+                buf[out:out + count] = src[self.pos:self.pos + count]
+                self.pos += count
+                self.literal -= count
+                out += count
+            elif self.repeat:
+                count = min(self.repeat, n - out)
+                value = self.value
+                for k in range(out, out + count):
+                    buf[k] = value
+                self.repeat -= count
+                out += count
+            elif self.pos < len(src):
+                header = src[self.pos]
+                if header < 0x80:
+                    self.literal = header + 1
+                    self.pos += 1
+                else:
+                    self.repeat = header - 0x7E
+                    self.value = src[self.pos + 1]
+                    self.pos += 2
+            else:
+                break
+        return out
@@ -0,0 +1,45 @@
+# satori_api.py
+#
+# The upstream endpoints a screen reads and how their responses are parsed.
+# Shared by DisplayService (MicroPython) and fleet_aggregator.py (CPython),
+# so both always ask for and decode the same fields.
+
+from json_stream import JsonExtractor
+
+ADDRESS_URL = "https://evr.cryptoscope.io/api/getaddress/?address="
+NEURONS_URL = "https://satorinet.io/reports/daily/stats/predictors/latest"
+ASSETS = ("SATORI", "LOLLIPOP")
+NEURON_FIELDS = (("Current Staking Requirement",), ("Current Neuron Version",), ("Competing Neurons",))
+
+
+def address_extractor(assets=ASSETS):
+    """A JsonExtractor for the fields of an ADDRESS_URL response."""
+    return JsonExtractor([("balance",)] + [("assets", asset) for asset in assets])
+
+
+def parse_address(fields, assets=ASSETS):
+    """
+    Returns:
+        tuple: (balance, {asset: amount}) from an address_extractor() that
+        read a whole response; assets the address does not hold are left out.
+    """
+    amounts = {}
+    for asset in assets:
+        amount = fields.get(("assets", asset))
+        if amount is not None:
+            amounts[asset] = float(amount)
+    return float(fields.get(("balance",), 0.0) or 0.0), amounts
+
+
+def neurons_extractor():
+    """A JsonExtractor for the fields of a NEURONS_URL response."""
+    return JsonExtractor(NEURON_FIELDS)
+
+
+def parse_neurons(fields):
+    """The neurons_data dict the screen shows, from a neurons_extractor() that read a whole response."""
+    return {
+        "current_stake_requirement": float(fields.get(NEURON_FIELDS[0], 0.0) or 0.0),
+        "current_neuron_version": fields.get(NEURON_FIELDS[1], "Unknown"),
+        "competing_neurons": int(fields.get(NEURON_FIELDS[2], 0) or 0),
+    }
@@ -1,9 +1,18 @@
 import framebuf
 
+GLYPH_CACHE_SIZE = 64       # Pre-scaled glyphs kept in RAM (a scale 3 glyph is 72 bytes)
+WARM_CHARS = "0123456789.$:"
+
 class ScaledText:
-    def __init__(self, framebuf, display_width):
+    def __init__(self, framebuf, display_width, cache_size=GLYPH_CACHE_SIZE):
         self.fb = framebuf
         self.display_width = display_width  # Use the actual display width
+        self.cache_size = cache_size
+        self._glyphs = {}       # (char, scale, color) -> pre-scaled FrameBuffer
+        self._lru = []          # cache keys, least recently used first
+        self._char_fb = None
+        self._bitmaps = {}      # (id(bitmap), width, height) -> FrameBuffer
+        self._palette = None
 
     def draw_bitmap(self, x, y, bitmap, width, height, color=0):
         """Draw a monochrome bitmap at a specified location."""
@@ -19,9 +28,108 @@ class ScaledText:
                 if bit:
                     self.fb.pixel(x + col, y + row, color)
 
+    def _scaled_glyph(self, char, scale, color):
+        """Return a cached FrameBuffer of `char` at `scale`, rendering it on a miss.
+
+        Glyph pixels are `color`, the background is the opposite colour so it
+        can be used as the blit key.
+        """
+        key = (char, scale, color)
+        glyph = self._glyphs.get(key)
+        if glyph is not None:
+            if self._lru[-1] != key:
+                self._lru.remove(key)
+                self._lru.append(key)
+            return glyph
+
+        if self._char_fb is None:
+            self._char_fb = framebuf.FrameBuffer(bytearray(8), 8, 8, framebuf.MONO_VLSB)
+        char_fb = self._char_fb
+        char_fb.fill(0)
+        char_fb.text(char, 0, 0, 1)
+
+        size = 8 * scale
+        glyph = framebuf.FrameBuffer(bytearray(size * size // 8), size, size, framebuf.MONO_VLSB)
+        glyph.fill(1 - color)
+        for cy in range(8):
+            for cx in range(8):
+                if char_fb.pixel(cx, cy):
+                    glyph.fill_rect(cx * scale, cy * scale, scale, scale, color)
+
+        if len(self._lru) >= self.cache_size:
+            del self._glyphs[self._lru.pop(0)]
+        self._glyphs[key] = glyph
+        self._lru.append(key)
+        return glyph
+
+    def warm_cache(self, chars=WARM_CHARS, scales=(2, 3), color=0):
+        """Pre-render glyphs that are drawn every update (digits, '.', '$', ':')."""
+        for scale in scales:
+            for char in chars:
+                self._scaled_glyph(char, scale, color)
+
+    def bitmap_framebuffer(self, bitmap, width, height, packing="hlsb", compressed=False):
+        """Return `bitmap` (as in bitmaps.py) as a FrameBuffer.
+
+        `packing` is "hlsb" (MSB-first rows, MONO_HLSB) or "vlsb" (LSB-top
+        columns, MONO_VLSB); `compressed` data is RLE-decoded with rle.py.
+        Built on first use and cached. An uncompressed bytes/bytearray
+        bitmap is wrapped in place where the firmware allows it; anything
+        else is copied once.
+        """
+        key = (id(bitmap), width, height)
+        fb = self._bitmaps.get(key)
+        if fb is None:
+            if packing == "hlsb":
+                fmt, size = framebuf.MONO_HLSB, (width + 7) // 8 * height
+            elif packing == "vlsb":
+                fmt, size = framebuf.MONO_VLSB, width * ((height + 7) // 8)
+            else:
+                raise ValueError(f"Unknown bitmap packing '{packing}'")
+            if compressed:
+                import rle
+                data = bytearray(size)
+                if rle.decode_into(bitmap, data) != size:
+                    raise ValueError(f"RLE bitmap does not decode to {width} x {height}")
+                bitmap = data
+            try:
+                fb = framebuf.FrameBuffer(bitmap, width, height, fmt)
+            except TypeError:
+                fb = framebuf.FrameBuffer(bytearray(bitmap), width, height, fmt)
+            self._bitmaps[key] = fb
+        return fb
+
+    def blit_bitmap(self, x, y, bitmap, width, height, color=0, transparent=True,
+                    packing="hlsb", compressed=False):
+        """Draw a monochrome bitmap with a single blit.
+
+        Set bits are drawn in `color`; clear bits are skipped when
+        `transparent`, otherwise drawn in the opposite colour. `packing` and
+        `compressed` describe the data as bitmaps.PACKING and bitmaps.RLE do.
+        Falls back to drawing pixel by pixel on firmware without blit
+        palette support.
+        """
+        source = self.bitmap_framebuffer(bitmap, width, height, packing, compressed)
+        if self._palette is None:
+            self._palette = framebuf.FrameBuffer(bytearray(1), 2, 1, framebuf.MONO_HLSB)
+        self._palette.pixel(0, 0, 1 - color)
+        self._palette.pixel(1, 0, color)
+        try:
+            self.fb.blit(source, x, y, 1 - color if transparent else -1, self._palette)
+        except TypeError:
+            if packing == "hlsb" and not compressed:
+                self.draw_bitmap(x, y, bitmap, width, height, color)
+                return
+            for row in range(height):
+                for col in range(width):
+                    if source.pixel(col, row):
+                        self.fb.pixel(x + col, y + row, color)
+
     def draw_scaled_text(self, text, x, y, scale=2, color=0):
         """Draw text with custom scaling factor.
 
+        Each character is one blit of a cached, pre-scaled glyph.
+
         Args:
             text: String to display
             x: X coordinate
@@ -29,23 +137,12 @@ class ScaledText:
             scale: Integer scaling factor (default 2)
             color: Pixel color (0 or 1)
         """
-        char_width = 8
-        char_height = 8
-        char_buf = bytearray(char_width * char_height)
-        char_fb = framebuf.FrameBuffer(char_buf, char_width, char_height, framebuf.MONO_VLSB)
+        if scale == 1:
+            self.fb.text(text, x, y, color)
+            return
 
+        char_width = 8
         cur_x = x
         for char in text:
-            char_fb.fill(0)
-            char_fb.text(char, 0, 0, 1)
-            for cy in range(char_height):
-                for cx in range(char_width):
-                    if char_fb.pixel(cx, cy):
-                        for sy in range(scale):
-                            for sx in range(scale):
-                                self.fb.pixel(
-                                    cur_x + cx * scale + sx,
-                                    y + cy * scale + sy,
-                                    color
-                                )
-            cur_x += char_width * scale
\ No newline at end of file
+            self.fb.blit(self._scaled_glyph(char, scale, color), cur_x, y, 1 - color)
+            cur_x += char_width * scale
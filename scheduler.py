@@ -0,0 +1,110 @@
+# scheduler.py
+#
+# Sleeps between screen updates with machine.lightsleep instead of a busy
+# one-second loop followed by machine.reset(). Live state (panel driver,
+# caches, the NTP-set clock) survives, so the next update starts straight
+# from the fetch instead of a full reboot.
+#
+# The RP2040 watchdog cannot be paused once started and its longest timeout
+# is ~8.3 s, so the sleep is split into chunks shorter than that and the
+# watchdog is fed between them.
+#
+# The clock and sleep functions are injectable so the timing logic can be
+# exercised on a PC.
+
+import time
+try:
+    import machine
+except ImportError:
+    machine = None
+
+SLEEP_CHUNK_MS = 5000   # well inside the 8.3 s watchdog timeout
+MAX_FAILURES = 3        # consecutive failed updates before giving up
+
+
+def _default_sleeper(ms):
+    if machine and hasattr(machine, "lightsleep"):
+        machine.lightsleep(ms)
+    else:
+        time.sleep(ms / 1000)
+
+
+class Scheduler:
+    """
+    Run an update every `interval` seconds, sleeping in between.
+
+    clock() returns seconds (time.time by default); sleeper(ms) sleeps
+    for about `ms` milliseconds (machine.lightsleep on the Pico).
+    """
+
+    def __init__(self, interval, watchdog=None, clock=time.time, sleeper=_default_sleeper,
+                 chunk_ms=SLEEP_CHUNK_MS, max_failures=MAX_FAILURES):
+        self.interval = interval
+        self.watchdog = watchdog
+        self.clock = clock
+        self.sleeper = sleeper
+        self.chunk_ms = chunk_ms
+        self.max_failures = max_failures
+        # Added to clock() when a sleep did not advance it (a clock that
+        # stops during lightsleep would otherwise make us sleep forever)
+        self.offset = 0
+
+    def now(self):
+        return self.clock() + self.offset
+
+    def sleep_chunk(self, ms):
+        before = self.now()
+        self.sleeper(ms)
+        slept = self.now() - before
+        if slept < ms / 2000:
+            self.offset += ms / 1000 - max(slept, 0)
+        if self.watchdog:
+            self.watchdog.feed()
+
+    def sleep_until(self, deadline):
+        """Sleep in watchdog-safe chunks until now() reaches `deadline`."""
+        while True:
+            remaining_ms = int((deadline - self.now()) * 1000)
+            if remaining_ms <= 0:
+                return
+            self.sleep_chunk(min(self.chunk_ms, remaining_ms))
+
+    def next_deadline(self, started):
+        """
+        The next update time for an update that started at `started`: one
+        interval later, or now if that time has already passed.
+        """
+        return max(started + self.interval, self.now())
+
+    def run(self, update, cycles=None, before_sleep=None, after_wake=None):
+        """
+        Call update() every interval forever (or `cycles` times). An update
+        that raises is reported and retried at the next slot; after
+        max_failures in a row the exception is re-raised, so the caller can
+        fall back to a reset.
+
+        before_sleep() / after_wake() run around each sleep, e.g. to drop and
+        restore the CPU clock.
+        """
+        count = 0
+        failures = 0
+        while cycles is None or count < cycles:
+            started = self.now()
+            try:
+                update()
+                failures = 0
+            except Exception as e:
+                failures += 1
+                print(f"Update failed ({failures}/{self.max_failures}): {e}")
+                if failures >= self.max_failures:
+                    raise
+            count += 1
+            if cycles is not None and count >= cycles:
+                break
+            deadline = self.next_deadline(started)
+            print(f"Next update in {deadline - self.now():.0f}s")
+            if before_sleep:
+                before_sleep()
+            self.sleep_until(deadline)
+            if after_wake:
+                after_wake()
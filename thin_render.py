@@ -0,0 +1,129 @@
+"""
+thin_render.py: Render SatoriScreen frames on a host for thin-client screens.
+
+The screen's own layout code (DisplayService.update_display with ScaledText
+and FontWriter) runs unchanged on top of framebuf_emu, producing the exact
+4736-byte MONO_VLSB frame the Pico would draw. Served from the fleet
+aggregator as
+
+    GET /frame?addresses=ADDR1,ADDR2,...
+
+a screen with AGGREGATOR and THIN_CLIENT files streams the reply straight
+into panel RAM and does no rendering itself. Layout changes then only need
+this host updated.
+
+Needs NumPy, the modules the fleet aggregator needs, and MicroPython's 8x8
+font (see framebuf_emu); the font_to_py fonts are optional, as on the Pico:
+
+    FRAMEBUF_FONT=micropython/extmod/font_petme128_8x8.h python thin_render.py --port 8080
+    FRAMEBUF_FONT=... python thin_render.py --bench 500
+    FRAMEBUF_FONT=... python thin_render.py --output frame.bin
+
+The clock line uses the host's local time.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import sys
+import time
+
+import framebuf_emu
+
+sys.modules.setdefault("framebuf", framebuf_emu)
+
+import fleet_aggregator  # noqa: E402
+import fleet_record  # noqa: E402
+from display_service import DisplayService  # noqa: E402
+from scaled_text import ScaledText  # noqa: E402
+
+EPD_WIDTH = 128
+EPD_HEIGHT = 296
+FRAME_SIZE = EPD_WIDTH * EPD_HEIGHT // 8
+
+
+class HostFrame(framebuf_emu.FrameBuffer):
+    """Host double of EPD_2in9_Landscape: same size, layout and attributes, no panel."""
+
+    def __init__(self):
+        self.width = EPD_WIDTH
+        self.height = EPD_HEIGHT
+        self.buffer = bytearray(FRAME_SIZE)
+        super().__init__(self.buffer, EPD_HEIGHT, EPD_WIDTH, framebuf_emu.MONO_VLSB)
+
+
+class _Watchdog:
+    def feed(self):
+        pass
+
+
+class Renderer:
+    """One frame, ScaledText and glyph cache, reused for every render."""
+
+    def __init__(self):
+        self.frame = HostFrame()
+        self.service = DisplayService(EPD_WIDTH, EPD_HEIGHT)
+        self.text_handler = ScaledText(self.frame, EPD_WIDTH)
+        self.watchdog = _Watchdog()
+
+    def render(self, balance_data, neurons_data, satori_price, quiet=True):
+        """Return the frame for these values as bytes."""
+        output = io.StringIO() if quiet else sys.stdout
+        with contextlib.redirect_stdout(output):
+            ok = self.service.update_display(self.frame, self.text_handler, balance_data,
+                                             neurons_data, satori_price, self.watchdog, None)
+        if not ok:
+            raise RuntimeError(f"update_display failed: {output.getvalue() if quiet else ''}")
+        return bytes(self.frame.sync())
+
+
+def sample_data(i=0):
+    balance_data = {"balance": 1000.0 + i, "assets": {"SATORI": 123.45 + i, "LOLLIPOP": i % 2}}
+    neurons_data = {"current_stake_requirement": 50.0, "current_neuron_version": "0.3.10",
+                    "competing_neurons": 12000 + i}
+    return balance_data, neurons_data, round(0.5 + i / 1000, 4)
+
+
+def bench(count):
+    renderer = Renderer()
+    renderer.render(*sample_data())  # fill the glyph cache
+    started = time.perf_counter()
+    for i in range(count):
+        renderer.render(*sample_data(i))
+    elapsed = time.perf_counter() - started
+    print(f"{count} frames in {elapsed:.2f} s: {count / elapsed:.0f} frames/s, "
+          f"{elapsed / count * 1e3:.2f} ms per frame")
+
+
+def add_frame_route(aggregator, renderer):
+    async def frame(addresses):
+        balance_data, neurons_data, satori_price, _ = fleet_record.unpack(await aggregator.record(addresses))
+        return renderer.render(balance_data, neurons_data, satori_price)
+
+    aggregator.routes["/frame"] = frame
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render SatoriScreen frames on the host.")
+    parser.add_argument("--host", default="0.0.0.0", help="Address to listen on (default 0.0.0.0).")
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on (default 8080).")
+    parser.add_argument("--interval", type=int, default=fleet_aggregator.POLL_INTERVAL,
+                        help="Seconds between upstream polls.")
+    parser.add_argument("--bench", type=int, metavar="N", help="Render N sample frames and report the rate.")
+    parser.add_argument("--output", metavar="FILE", help="Write one sample frame to FILE and exit.")
+    args = parser.parse_args()
+
+    if args.bench:
+        bench(args.bench)
+    elif args.output:
+        with open(args.output, "wb") as file:
+            file.write(Renderer().render(*sample_data()))
+        print(f"Wrote {FRAME_SIZE} bytes to {args.output}")
+    else:
+        aggregator = fleet_aggregator.Aggregator(args.interval)
+        add_frame_route(aggregator, Renderer())
+        try:
+            asyncio.run(fleet_aggregator.serve(aggregator, args.host, args.port))
+        except KeyboardInterrupt:
+            pass